@@ -3,5 +3,54 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     DATABASE_URL: str = "sqlite:///./project_management.db"
+    # Keyset pagination of list endpoints
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 500
+    # Recent comments embedded per task by GET /projects/{id}?include=tasks.comments
+    INCLUDE_COMMENTS_DEFAULT: int = 5
+    INCLUDE_COMMENTS_MAX: int = 50
+    # Full-text search: title matches weigh SEARCH_TITLE_WEIGHT times body matches; snippets span SEARCH_SNIPPET_TOKENS tokens
+    SEARCH_TITLE_WEIGHT: float = 10.0
+    SEARCH_SNIPPET_TOKENS: int = 16
+    # Change log entries older than this are compacted away; clients with older sync cursors must resync
+    CHANGE_LOG_RETENTION_DAYS: int = 30
+    # Largest number of tasks accepted by one batch create request
+    TASK_BATCH_MAX_SIZE: int = 1000
+    # Largest number of users added or removed by one contributors request
+    CONTRIBUTOR_BATCH_MAX_SIZE: int = 1000
+    # Project exports fetch rows in batches of EXPORT_YIELD_PER and flush ~EXPORT_CHUNK_BYTES at a time
+    EXPORT_YIELD_PER: int = 1000
+    EXPORT_CHUNK_BYTES: int = 65536
+    # Imports commit every IMPORT_CHUNK_SIZE rows and report at most IMPORT_MAX_ERRORS row errors
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 100
+    # Per-process cache of (user, project) -> role lookups
+    ACCESS_CACHE_SIZE: int = 10000
+    ACCESS_CACHE_TTL_SECONDS: int = 60
+    # Serialize list responses straight from query rows instead of validating ORM objects
+    FAST_SERIALIZATION: bool = False
+    # Serialized bodies of hot GET endpoints, bounded by total bytes (0 disables the cache)
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    # Live project events: per-listener queue bound, keep-alive interval and client reconnect delay
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_RETRY_MS: int = 3000
+    # Funnel write endpoints through one writer committing each GROUP_COMMIT_WINDOW_MS batch at once (file databases)
+    GROUP_COMMIT: bool = False
+    GROUP_COMMIT_WINDOW_MS: float = 2.0
+    GROUP_COMMIT_MAX_BATCH: int = 64
+    # Per-process cache of bearer token -> authenticated user
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    # Password hashing runs in a dedicated process pool (0 = use the threadpool)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_IN_FLIGHT: int = 8
+    # pbkdf2 rounds are calibrated at startup to hit this latency (0 = keep defaults)
+    PASSWORD_HASH_TARGET_MS: int = 50
+    PASSWORD_HASH_MIN_ROUNDS: int = 29000
+    PASSWORD_HASH_MAX_ROUNDS: int = 2000000
+    # Stored hashes whose rounds drift further than this from target are rehashed on login
+    PASSWORD_HASH_ROUNDS_TOLERANCE: float = 0.25
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,141 @@
+import asyncio
+import itertools
+import json
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set
+from .config import settings
+
+PENDING_EVENTS = "pending_events"
+
+class ProjectEvent(NamedTuple):
+    id: int
+    project_id: int
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n".encode()
+
+class Subscription:
+    """One listener's queue of a project's events, owned by the event loop that created it.
+
+    The queue is bounded: a listener that falls ``max_queued`` events behind is
+    dropped instead of holding events (and memory) for it indefinitely. Dropping
+    empties the queue and leaves a single ``None`` marker for the reader.
+    """
+
+    def __init__(self, project_id: int, max_queued: int):
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Optional[ProjectEvent]]" = asyncio.Queue(max_queued)
+        self.dropped = False
+
+    def offer(self, project_event: ProjectEvent):
+        # Runs on self.loop
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(project_event)
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+class EventBroker:
+    """In-process pub/sub of project changes.
+
+    ``publish`` may be called from any thread (sync endpoints run in the
+    threadpool); delivery is handed to each subscriber's event loop. Events
+    only reach listeners connected to this process.
+    """
+
+    def __init__(self, max_queued: int):
+        self.max_queued = max_queued
+        self.published = 0
+        self.dropped = 0
+        self._ids = itertools.count(1)
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id: int) -> Subscription:
+        """Start listening to a project; call from the event loop that will read the subscription."""
+        subscription = Subscription(project_id, self.max_queued)
+        with self._lock:
+            self._subscriptions.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.project_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.project_id]
+
+    def publish(self, project_id: int, event_type: str, data: dict):
+        with self._lock:
+            project_event = ProjectEvent(next(self._ids), project_id, event_type, data)
+            subscriptions = list(self._subscriptions.get(project_id, ()))
+            self.published += 1
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(self._deliver, subscription, project_event)
+            except RuntimeError:  # the listener's loop has closed
+                self.unsubscribe(subscription)
+
+    def _deliver(self, subscription: Subscription, project_event: ProjectEvent):
+        subscription.offer(project_event)
+        if subscription.dropped:
+            self.unsubscribe(subscription)
+            with self._lock:
+                self.dropped += 1
+
+    async def stream(self, subscription: Subscription, heartbeat: float, closes_stream=None) -> AsyncIterator[bytes]:
+        """Server-Sent Events for a subscription, with a comment line every ``heartbeat`` seconds of silence.
+
+        Ends when the subscriber is dropped for falling behind, or after an event
+        for which ``closes_stream(event)`` is true.
+        """
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n".encode()
+            while True:
+                try:
+                    project_event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if project_event is None:
+                    yield b"event: dropped\ndata: {}\n\n"
+                    return
+                yield project_event.encode()
+                if closes_stream is not None and closes_stream(project_event):
+                    return
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+event_broker = EventBroker(settings.EVENTS_QUEUE_SIZE)
+
+def publish_on_commit(db: Session, project_id: int, event_type: str, **data):
+    """Queue an event to publish once the session's transaction commits; a rollback discards it."""
+    pending: List[tuple] = db.info.setdefault(PENDING_EVENTS, [])
+    pending.append((project_id, event_type, {"project_id": project_id, **data}))
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session: Session):
+    for project_id, event_type, data in session.info.pop(PENDING_EVENTS, ()):
+        event_broker.publish(project_id, event_type, data)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session: Session):
+    session.info.pop(PENDING_EVENTS, None)
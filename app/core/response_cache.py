@@ -0,0 +1,157 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+from .config import settings
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+class ResponseCacheBackend(ABC):
+    """Storage for cached responses.
+
+    The default keeps entries in process memory; subclass it to share entries
+    between workers through an external store. Keys and tags are strings and a
+    ``CachedResponse`` is plain bytes and strings, so both serialize trivially.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse, tags: Iterable[str] = ()):
+        ...
+
+    @abstractmethod
+    def invalidate_tag(self, tag: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+class MemoryResponseBackend(ResponseCacheBackend):
+    """Thread-safe LRU of responses, bounded by the total size of the stored bodies and headers."""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[CachedResponse, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is None:
+                return None
+            self._entries.move_to_end(key)
+            return stored[0]
+
+    def set(self, key: str, entry: CachedResponse, tags: Iterable[str] = ()):
+        if entry.size > min(self.max_entry_bytes, self.max_bytes):
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (entry, tags)
+            self.bytes += entry.size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tag(self, tag: str):
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+    def _remove(self, key: str):
+        entry, tags = self._entries.pop(key)
+        self.bytes -= entry.size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class ResponseCache:
+    """Read-through cache of serialized GET responses with hit and miss counters.
+
+    It never checks authorization: callers run their access checks first and
+    build keys that cover everything the body depends on (resource, version,
+    caller role, query parameters).
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def set_backend(self, backend: ResponseCacheBackend):
+        self.backend = backend
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: CachedResponse, tags: Iterable[str] = ()):
+        if self.enabled:
+            self.backend.set(key, entry, tags)
+
+    def invalidate_project(self, project_id: int):
+        self.backend.invalidate_tag(project_tag(project_id))
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {"hits": self.hits, "misses": self.misses}
+        return {"enabled": self.enabled, **counters, **self.backend.stats()}
+
+def project_tag(project_id: int) -> str:
+    return f"project:{project_id}"
+
+def response_key(resource: str, version: int, role, *variant) -> str:
+    role = getattr(role, "name", role)
+    return ":".join(str(part) for part in (resource, f"v{version}", role, *variant))
+
+response_cache = ResponseCache(
+    MemoryResponseBackend(settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_MAX_ENTRY_BYTES),
+    enabled=settings.RESPONSE_CACHE_MAX_BYTES > 0
+)
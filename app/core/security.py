@@ -1,24 +1,127 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+import anyio
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from passlib.hash import pbkdf2_sha256
+from typing import NamedTuple, Optional
+from .cache import TTLCache
 from .config import settings
 import os
 
+logger = logging.getLogger(__name__)
+
 # Use pbkdf2 for all environments to avoid bcrypt issues
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+class PasswordHashPolicy(NamedTuple):
+    rounds: int
+    target_ms: Optional[int] = None
+    measured_ms: Optional[float] = None
+    calibrated_at: Optional[datetime] = None
+
+password_hash_policy = PasswordHashPolicy(rounds=pbkdf2_sha256.default_rounds)
+
+# Authenticated users keyed by bearer token, tagged with the user id
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Truncate password to 72 characters for bcrypt compatibility
     if len(plain_password) > 72:
         plain_password = plain_password[:72]
     return pwd_context.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: int = None) -> str:
     # Truncate password to 72 characters for bcrypt compatibility
     if len(password) > 72:
         password = password[:72]
+    if rounds is not None:
+        # Pool workers do not share the calibrated context, so rounds are passed in
+        return pbkdf2_sha256.using(rounds=rounds).hash(password)
     return pwd_context.hash(password)
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+def calibrate_password_hashing(target_ms: int = None) -> PasswordHashPolicy:
+    """Pick pbkdf2 rounds so that one hash takes about target_ms on this machine."""
+    global password_hash_policy
+    target_ms = settings.PASSWORD_HASH_TARGET_MS if target_ms is None else target_ms
+    if target_ms <= 0:
+        return password_hash_policy
+
+    sample_rounds = 10000
+    hasher = pbkdf2_sha256.using(rounds=sample_rounds)
+    samples = []
+    for _ in range(3):
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        samples.append(time.perf_counter() - started)
+    measured_ms = min(samples) * 1000
+
+    rounds = int(sample_rounds * target_ms / measured_ms)
+    rounds = max(settings.PASSWORD_HASH_MIN_ROUNDS, min(settings.PASSWORD_HASH_MAX_ROUNDS, rounds))
+    tolerance = settings.PASSWORD_HASH_ROUNDS_TOLERANCE
+    pwd_context.update(
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=int(rounds * (1 - tolerance)),
+        pbkdf2_sha256__max_rounds=int(rounds * (1 + tolerance)),
+    )
+    password_hash_policy = PasswordHashPolicy(
+        rounds=rounds,
+        target_ms=target_ms,
+        measured_ms=measured_ms * rounds / sample_rounds,
+        calibrated_at=datetime.utcnow(),
+    )
+    logger.info("Calibrated pbkdf2_sha256 password hashing: %s", password_hash_policy)
+    return password_hash_policy
+
+_hash_pool = None
+# One semaphore per event loop, capping hash operations in flight
+_hash_limiters = weakref.WeakKeyDictionary()
+
+def _get_hash_pool():
+    global _hash_pool
+    if _hash_pool is None and settings.PASSWORD_HASH_WORKERS > 0:
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_pool
+
+def _get_hash_limiter() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    limiter = _hash_limiters.get(loop)
+    if limiter is None:
+        limiter = _hash_limiters[loop] = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_IN_FLIGHT)
+    return limiter
+
+async def _run_hash_operation(func, *args):
+    async with _get_hash_limiter():
+        pool = _get_hash_pool()
+        if pool is None:
+            return await anyio.to_thread.run_sync(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password off the event loop and the request threadpool."""
+    return await _run_hash_operation(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash off the event loop and the request threadpool."""
+    return await _run_hash_operation(get_password_hash, password, password_hash_policy.rounds)
+
+def shutdown_password_hashing():
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown()
+        _hash_pool = None
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
@@ -29,12 +132,21 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
+def decode_token(token: str):
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+def verify_token(token: str):
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    username: str = payload.get("sub")
+    if username is None:
+        return None
+    return username
+
+def invalidate_principal(user_id: int):
+    """Drop every cached authentication of a user, e.g. after deactivation."""
+    principal_cache.invalidate_tag(user_id)
\ No newline at end of file
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime
+from enum import Enum
+from operator import itemgetter
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the standard library encoder produces the same JSON
+    orjson = None
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Encode to compact UTF-8 JSON, byte-for-byte what Pydantic's dump_json gives for the same data."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+class RowSerializer:
+    """Turns flat query rows into the dicts a response schema would produce, skipping validation.
+
+    ``columns`` are the columns to select, in order; nested schemas (e.g. a task's
+    ``assigned_user``) are selected from the given entity under ``<field>__<name>``
+    labels and come out as ``None`` when the nested row's id is NULL. The field
+    layout is worked out once, so serializing a row is a couple of tuple lookups.
+    ``fields`` restricts both the selected columns and the output to a subset.
+    """
+
+    def __init__(self, schema: Type[BaseModel], entity, fields: Optional[Sequence[str]] = None,
+                 **nested: Tuple[Type[BaseModel], Any]):
+        self.schema = schema
+        self.entity = entity
+        self.nested = nested
+        self.fields = tuple(fields) if fields else tuple(schema.model_fields)
+        self.columns: List = []
+        self._plan: List[Tuple[str, Callable]] = []
+        self._subsets: Dict[Tuple[str, ...], "RowSerializer"] = {}
+        for name in self.fields:
+            if name in nested:
+                nested_schema, nested_entity = nested[name]
+                start = len(self.columns)
+                nested_fields = tuple(nested_schema.model_fields)
+                self.columns.extend(getattr(nested_entity, field).label(f"{name}__{field}") for field in nested_fields)
+                self._plan.append((name, self._nested_getter(nested_fields, start, start + nested_fields.index("id"))))
+            else:
+                self._plan.append((name, itemgetter(len(self.columns))))
+                self.columns.append(getattr(entity, name))
+
+    def subset(self, fields: Optional[Sequence[str]]) -> "RowSerializer":
+        """The serializer for a subset of the fields, built once per distinct subset."""
+        if not fields:
+            return self
+        key = tuple(fields)
+        serializer = self._subsets.get(key)
+        if serializer is None:
+            serializer = self._subsets[key] = RowSerializer(self.schema, self.entity, key, **self.nested)
+        return serializer
+
+    def includes(self, name: str) -> bool:
+        return name in self.fields
+
+    def select_columns(self, *required) -> List:
+        """The columns to select, plus any of ``required`` (e.g. pagination keys) the fields leave out."""
+        selected = {column.key for column in self.columns}
+        return self.columns + [column for column in required if column.key not in selected]
+
+    @staticmethod
+    def _nested_getter(fields: Tuple[str, ...], start: int, id_index: int) -> Callable:
+        values = itemgetter(*range(start, start + len(fields)))
+        def get(row):
+            return dict(zip(fields, values(row))) if row[id_index] is not None else None
+        return get
+
+    def __call__(self, row) -> Dict[str, Any]:
+        return {name: get(row) for name, get in self._plan}
+
+    def many(self, rows) -> List[Dict[str, Any]]:
+        return [self(row) for row in rows]
@@ -1,4 +1,10 @@
 from .user import user_crud
 from .project import project_crud
 from .task import task_crud
-from .comment import comment_crud
\ No newline at end of file
+from .comment import comment_crud
+from .access import access_crud
+from .export import export_crud
+from .importer import import_crud
+from .stats import stats_crud
+from .search import search_crud
+from .changes import change_crud
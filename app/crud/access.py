@@ -0,0 +1,87 @@
+from sqlalchemy import event, select, and_
+from sqlalchemy.orm import Session
+from typing import NamedTuple, Optional
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models.access_rights import ProjectAccess, AccessRole
+from ..models.project import Project
+from ..models.user import User
+
+# Roles that may read and write a project's tasks and comments
+MEMBER_ROLES = (AccessRole.OWNER, AccessRole.CONTRIBUTOR)
+# Strongest role first, for users holding more than one row in a project
+ROLE_PRECEDENCE = (AccessRole.OWNER, AccessRole.CONTRIBUTOR, AccessRole.VISITOR)
+
+class ProjectGrant(NamedTuple):
+    project_id: int
+    project_title: str
+    owner_id: int
+    owner_username: str
+    role: Optional[AccessRole]
+
+    @property
+    def is_member(self) -> bool:
+        return self.role in MEMBER_ROLES
+
+STALE_PROJECT_GRANTS = "stale_project_grants"
+
+class AccessCRUD:
+    def __init__(self):
+        self._cache = TTLCache(settings.ACCESS_CACHE_SIZE, settings.ACCESS_CACHE_TTL_SECONDS)
+
+    def get_project_grant(self, db: Session, user_id: int, project_id: int) -> Optional[ProjectGrant]:
+        """Resolve the role of a user in a project, or None if the project does not exist."""
+        key = (project_id, user_id)
+        grant = self._cache.get(key)
+        if grant is not None:
+            return grant
+
+        rows = db.execute(
+            select(Project.id, Project.title, Project.owner_id, User.username, ProjectAccess.role)
+            .join(User, User.id == Project.owner_id)
+            .outerjoin(ProjectAccess, and_(
+                ProjectAccess.project_id == Project.id,
+                ProjectAccess.user_id == user_id
+            ))
+            .where(Project.id == project_id)
+        ).all()
+        if not rows:
+            return None
+
+        roles = {row.role for row in rows}
+        role = next((r for r in ROLE_PRECEDENCE if r in roles), None)
+        first = rows[0]
+        grant = ProjectGrant(first.id, first.title, first.owner_id, first.username, role)
+        self._cache.set(key, grant, tags=[project_id])
+        return grant
+
+    def visible_project_ids(self, user_id: int):
+        """Selectable of the ids of every project the user owns or contributes to."""
+        return select(ProjectAccess.project_id).where(
+            ProjectAccess.user_id == user_id,
+            ProjectAccess.role.in_(MEMBER_ROLES)
+        )
+
+    def invalidate_project(self, project_id: int):
+        self._cache.invalidate_tag(project_id)
+
+    def invalidate_project_on_commit(self, db: Session, project_id: int):
+        """Drop the project's cached grants once the session's transaction commits; a rollback keeps them."""
+        db.info.setdefault(STALE_PROJECT_GRANTS, set()).add(project_id)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
+
+access_crud = AccessCRUD()
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_grants(session: Session):
+    for project_id in session.info.pop(STALE_PROJECT_GRANTS, ()):
+        access_crud.invalidate_project(project_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_stale_grants(session: Session):
+    session.info.pop(STALE_PROJECT_GRANTS, None)
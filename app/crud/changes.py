@@ -0,0 +1,104 @@
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from ..models.change import ProjectChange, ChangeLogWatermark, ChangeEntity, ChangeOp
+from .pagination import decode_cursor, encode_cursor
+
+class ChangePage(NamedTuple):
+    # Latest change of each entity changed in the page, in log order
+    changes: List[ProjectChange]
+    cursor: str
+    has_more: bool = False
+    resync_required: bool = False
+
+class ChangeCRUD:
+    """Maintains project_changes, the per-project log behind delta sync.
+
+    ``record`` only executes a statement, inside the caller's transaction, so a
+    change is logged if and only if the mutation commits.
+    """
+    cursor_columns = (ProjectChange.id,)
+
+    def record(self, db: Session, project_id: int, entity: ChangeEntity, op: ChangeOp, entity_ids: Iterable[int]):
+        changed_at = datetime.utcnow()
+        rows = [
+            {"project_id": project_id, "entity": entity, "entity_id": entity_id, "op": op, "changed_at": changed_at}
+            for entity_id in entity_ids
+        ]
+        if rows:
+            db.execute(insert(ProjectChange), rows)
+
+    def head(self, db: Session, project_id: int) -> int:
+        """Id of the project's latest change, or of the latest compacted one when nothing is left."""
+        latest = db.execute(select(func.max(ProjectChange.id)).where(ProjectChange.project_id == project_id)).scalar()
+        return latest if latest is not None else self.watermark(db, project_id)
+
+    def watermark(self, db: Session, project_id: int) -> int:
+        return db.execute(
+            select(ChangeLogWatermark.compacted_through).where(ChangeLogWatermark.project_id == project_id)
+        ).scalar() or 0
+
+    def get_since(self, db: Session, project_id: int, since: Optional[str], limit: int) -> ChangePage:
+        """Changes after the ``since`` cursor, at most ``limit`` log entries.
+
+        Without a cursor, or with one older than the last compaction, the log
+        cannot tell what the client is missing: the page asks for a resync and
+        carries the cursor to continue from after reloading the project.
+        """
+        if since is None:
+            return ChangePage([], encode_cursor([self.head(db, project_id)]), resync_required=True)
+        since_id, = decode_cursor(since, self.cursor_columns)
+        if since_id < self.watermark(db, project_id):
+            return ChangePage([], encode_cursor([self.head(db, project_id)]), resync_required=True)
+
+        entries = db.execute(
+            select(ProjectChange)
+            .where(ProjectChange.project_id == project_id, ProjectChange.id > since_id)
+            .order_by(ProjectChange.id)
+            .limit(limit + 1)
+        ).scalars().all()
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        if not entries:
+            return ChangePage([], since)
+
+        latest: Dict[Tuple[ChangeEntity, int], ProjectChange] = {}
+        for entry in entries:
+            latest.pop((entry.entity, entry.entity_id), None)
+            latest[(entry.entity, entry.entity_id)] = entry
+        return ChangePage(list(latest.values()), encode_cursor([entries[-1].id]), has_more)
+
+    def compact(self, db: Session, older_than: datetime) -> Tuple[int, int]:
+        """Shrink the log; returns (superseded entries removed, expired entries removed).
+
+        Entries superseded by a later change of the same entity are removed
+        without affecting any client. Entries older than ``older_than`` are
+        removed too, raising each project's watermark so that clients holding
+        older cursors are told to resync.
+        """
+        latest_ids = (
+            select(func.max(ProjectChange.id))
+            .group_by(ProjectChange.project_id, ProjectChange.entity, ProjectChange.entity_id)
+        )
+        superseded = db.execute(delete(ProjectChange).where(ProjectChange.id.not_in(latest_ids))).rowcount
+
+        expired = (
+            select(ProjectChange.project_id, func.max(ProjectChange.id))
+            .where(ProjectChange.changed_at < older_than)
+            .group_by(ProjectChange.project_id)
+        )
+        stmt = sqlite_insert(ChangeLogWatermark).from_select(["project_id", "compacted_through"], expired)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["project_id"],
+            set_={"compacted_through": func.max(ChangeLogWatermark.compacted_through, stmt.excluded.compacted_through)}
+        ))
+        removed = db.execute(delete(ProjectChange).where(ProjectChange.changed_at < older_than)).rowcount
+        return superseded, removed
+
+    def delete_project(self, db: Session, project_id: int):
+        db.execute(delete(ProjectChange).where(ProjectChange.project_id == project_id))
+        db.execute(delete(ChangeLogWatermark).where(ChangeLogWatermark.project_id == project_id))
+
+change_crud = ChangeCRUD()
@@ -1,18 +1,79 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload
+from typing import Dict, Iterable, List
+from ..core.events import publish_on_commit
+from ..core.serialization import RowSerializer
+from ..models.change import ChangeEntity, ChangeOp
 from ..models.comment import Comment
-from ..schemas.comment import CommentCreate
+from ..models.task import Task
+from ..models.user import User
+from ..schemas.comment import CommentCreate, CommentResponse
+from ..schemas.user import UserResponse
+from .changes import change_crud
+from .pagination import Page, paginate
+from .project import project_crud
+from .stats import stats_crud
 
 class CommentCRUD:
+    page_order = (Comment.created_at, Comment.id)
+    row_serializer = RowSerializer(CommentResponse, Comment, author=(UserResponse, User))
+
     def create(self, db: Session, comment_create: CommentCreate, author_id: int) -> Comment:
         comment_data = comment_create.model_dump()
         db_comment = Comment(**comment_data, author_id=author_id)
         db.add(db_comment)
+        db.flush()
+        project_ids = project_crud.touch(db, select(Task.project_id).where(Task.id == db_comment.task_id).scalar_subquery())
+        stats_crud.record_comments(db, {project_id: 1 for project_id in project_ids})
+        for project_id in project_ids:
+            publish_on_commit(db, project_id, "comment.created", task_id=db_comment.task_id, comment_id=db_comment.id)
+            change_crud.record(db, project_id, ChangeEntity.COMMENT, ChangeOp.INSERT, [db_comment.id])
         db.commit()
         db.refresh(db_comment)
         return db_comment
 
-    def get_by_task(self, db: Session, task_id: int) -> List[Comment]:
-        return db.query(Comment).filter(Comment.task_id == task_id).all()
+    def get_by_ids(self, db: Session, comment_ids: List[int]) -> List[Comment]:
+        if not comment_ids:
+            return []
+        return db.query(Comment).options(joinedload(Comment.author)).filter(Comment.id.in_(comment_ids)).order_by(Comment.id).all()
+
+    def get_by_task(self, db: Session, task_id: int, limit: int, after: str = None, rows: RowSerializer = None) -> Page:
+        if rows is not None:
+            query = db.query(*rows.select_columns(*self.page_order)).select_from(Comment)
+            if rows.includes("author"):
+                query = query.join(User, Comment.author_id == User.id)
+        else:
+            query = db.query(Comment).options(joinedload(Comment.author))
+        query = query.filter(Comment.task_id == task_id)
+        return paginate(query, self.page_order, limit, after)
+
+    def get_recent_by_tasks(self, db: Session, task_ids: Iterable[int], per_task: int) -> Dict[int, List[Comment]]:
+        """The latest ``per_task`` comments of each task, oldest first, in one query.
+
+        ROW_NUMBER() over the (task_id, created_at, id) index ranks each task's
+        comments, so the cost does not grow with the number of tasks.
+        """
+        task_ids = set(task_ids)
+        if not task_ids:
+            return {}
+        ranked = select(
+            Comment.id,
+            func.row_number().over(
+                partition_by=Comment.task_id,
+                order_by=(Comment.created_at.desc(), Comment.id.desc())
+            ).label("rank")
+        ).where(Comment.task_id.in_(task_ids)).subquery()
+        comments = (
+            db.query(Comment)
+            .options(joinedload(Comment.author))
+            .join(ranked, ranked.c.id == Comment.id)
+            .filter(ranked.c.rank <= per_task)
+            .order_by(Comment.task_id, *self.page_order)
+            .all()
+        )
+        by_task: Dict[int, List[Comment]] = {task_id: [] for task_id in task_ids}
+        for comment in comments:
+            by_task[comment.task_id].append(comment)
+        return by_task
 
 comment_crud = CommentCRUD()
\ No newline at end of file
@@ -0,0 +1,64 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Iterable, Iterator
+from ..core.config import settings
+from ..core.serialization import dumps
+from ..models.access_rights import ProjectAccess, AccessRole
+from ..models.comment import Comment
+from ..models.project import Project
+from ..models.task import Task
+from ..models.user import User
+
+class ExportCRUD:
+    def iter_project(self, db: Session, project_id: int) -> Iterator[dict]:
+        """Yield a project snapshot as flat records: the project, then contributors, tasks and comments.
+
+        Rows are streamed from server-side cursors in batches of EXPORT_YIELD_PER,
+        so memory stays flat however large the project is.
+        """
+        project = db.execute(
+            select(Project.id, Project.title, Project.description, Project.owner_id, Project.created_at)
+            .where(Project.id == project_id)
+        ).first()
+        if project is None:
+            return
+        yield {"type": "project", **project._asdict()}
+
+        yield from self._stream(db, "contributor",
+            select(User.id, User.username)
+            .join(ProjectAccess, ProjectAccess.user_id == User.id)
+            .where(ProjectAccess.project_id == project_id, ProjectAccess.role == AccessRole.CONTRIBUTOR)
+            .order_by(User.id)
+        )
+        yield from self._stream(db, "task",
+            select(Task.id, Task.project_id, Task.title, Task.description, Task.status,
+                   Task.assigned_user_id, Task.created_at)
+            .where(Task.project_id == project_id)
+            .order_by(Task.created_at, Task.id)
+        )
+        yield from self._stream(db, "comment",
+            select(Comment.id, Comment.task_id, Comment.author_id, Comment.text, Comment.created_at)
+            .join(Task, Task.id == Comment.task_id)
+            .where(Task.project_id == project_id)
+            .order_by(Comment.task_id, Comment.created_at, Comment.id)
+        )
+
+    def _stream(self, db: Session, record_type: str, stmt) -> Iterator[dict]:
+        result = db.execute(stmt.execution_options(yield_per=settings.EXPORT_YIELD_PER))
+        for row in result:
+            yield {"type": record_type, **row._asdict()}
+
+    def iter_ndjson(self, records: Iterable[dict]) -> Iterator[bytes]:
+        """Encode records as NDJSON, grouped into chunks of roughly EXPORT_CHUNK_BYTES."""
+        buffer, size = [], 0
+        for record in records:
+            line = dumps(record) + b"\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= settings.EXPORT_CHUNK_BYTES:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+export_crud = ExportCRUD()
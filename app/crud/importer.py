@@ -0,0 +1,239 @@
+import csv
+import json
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from ..core.config import settings
+from ..core.events import publish_on_commit
+from ..models.access_rights import ProjectAccess, AccessRole
+from ..models.change import ChangeEntity, ChangeOp
+from ..models.comment import Comment
+from ..models.project import Project
+from ..models.task import Task, TaskStatus
+from ..schemas.comment import CommentCreate
+from ..schemas.importer import ImportRowError, ImportSummary
+from ..schemas.project import ProjectCreate
+from ..schemas.task import TaskCreate
+from .changes import change_crud
+from .project import project_crud
+from .stats import stats_crud
+from .user import user_crud
+
+IMPORT_FORMATS = ("ndjson", "csv")
+# Record types written by the exporter that the importer does not recreate
+IGNORED_TYPES = ("contributor",)
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, dict]]:
+    """Yield (line number, record) pairs from an NDJSON or CSV text stream, one row at a time."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, {key: (value if value != "" else None) for key, value in record.items()}
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            record = {"type": None, "_error": f"Invalid JSON: {e.msg}"}
+        yield line_number, record if isinstance(record, dict) else {"type": None, "_error": "Expected a JSON object"}
+
+def _describe(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+    return str(error)
+
+def _clean_text(value: Optional[str], label: str, max_length: int, required: bool = True) -> Optional[str]:
+    # The rules of the models' title/description/text validators
+    if required and (not value or not value.strip()):
+        raise ValueError(f"{label} cannot be empty")
+    if value and len(value) > max_length:
+        raise ValueError(f"{label} cannot exceed {max_length} characters")
+    return value.strip() if value else value
+
+def _parse_created_at(value) -> datetime:
+    if value is None:
+        return datetime.utcnow()
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+class _ImportRun:
+    """Buffers validated rows per type and writes them in chunks, remapping source ids to new ones."""
+
+    def __init__(self, db: Session, owner_id: int, chunk_size: int):
+        self.db = db
+        self.owner_id = owner_id
+        self.chunk_size = chunk_size
+        self.summary = ImportSummary()
+        self.project_ids: Dict[str, int] = {}
+        self.task_ids: Dict[str, int] = {}
+        self.task_projects: Dict[int, int] = {}
+        self.pending: Dict[str, List[Tuple[int, Optional[str], dict]]] = {"project": [], "task": [], "comment": []}
+
+    def error(self, line: int, detail: str):
+        self.summary.error_count += 1
+        if len(self.summary.errors) < settings.IMPORT_MAX_ERRORS:
+            self.summary.errors.append(ImportRowError(line=line, detail=detail))
+
+    def add(self, line: int, record: dict):
+        record_type = record.get("type")
+        if "_error" in record:
+            return self.error(line, record["_error"])
+        if record_type in IGNORED_TYPES:
+            self.summary.skipped += 1
+            return
+        validate = getattr(self, f"_validate_{record_type}", None) if record_type in self.pending else None
+        if validate is None:
+            return self.error(line, f"Unknown record type '{record_type}'")
+        try:
+            row = validate(record)
+        except ValueError as e:
+            return self.error(line, _describe(e))
+
+        source_id = record.get("id")
+        self.pending[record_type].append((line, str(source_id) if source_id is not None else None, row))
+        if len(self.pending[record_type]) >= self.chunk_size:
+            self.flush(record_type)
+
+    def _validate_project(self, record: dict) -> dict:
+        project_create = ProjectCreate(**record)
+        return {"title": _clean_text(project_create.title, "Project title", 200),
+                "description": _clean_text(project_create.description, "Project description", 2000, required=False),
+                "owner_id": self.owner_id,
+                "created_at": _parse_created_at(record.get("created_at"))}
+
+    def _validate_task(self, record: dict) -> dict:
+        task_create = TaskCreate(**record)
+        return {"title": _clean_text(task_create.title, "Task title", 200),
+                "description": _clean_text(task_create.description, "Task description", 1000, required=False),
+                "project_id": str(task_create.project_id),
+                "assigned_user_id": task_create.assigned_user_id,
+                "status": TaskStatus(record.get("status") or TaskStatus.TODO.value),
+                "created_at": _parse_created_at(record.get("created_at"))}
+
+    def _validate_comment(self, record: dict) -> dict:
+        comment_create = CommentCreate(**record)
+        if comment_create.task_id is None:
+            raise ValueError("task_id: Field required")
+        author_id = record.get("author_id")
+        return {"text": _clean_text(comment_create.text, "Comment text", 1000), "task_id": str(comment_create.task_id),
+                "author_id": int(author_id) if author_id is not None else None,
+                "created_at": _parse_created_at(record.get("created_at"))}
+
+    def flush(self, record_type: str):
+        # Parents first, so that every reference in this chunk can be remapped
+        if record_type in ("task", "comment"):
+            self._flush_projects()
+        if record_type == "comment":
+            self._flush_tasks()
+        getattr(self, f"_flush_{record_type}s")()
+
+    def flush_all(self):
+        self.flush("comment")
+
+    def _take(self, record_type: str):
+        pending, self.pending[record_type] = self.pending[record_type], []
+        return pending
+
+    def _remap(self, pending, field: str, ids: Dict[str, int], label: str):
+        remapped = []
+        for line, source_id, row in pending:
+            new_id = ids.get(row[field])
+            if new_id is None:
+                self.error(line, f"Unknown {label} '{row[field]}'; it must appear earlier in the import")
+                continue
+            remapped.append((line, source_id, {**row, field: new_id}))
+        return remapped
+
+    def _insert_with_ids(self, model, pending, ids: Dict[str, int]) -> List[int]:
+        # sort_by_parameter_order would make SQLite insert row by row; each batched
+        # multi-row INSERT assigns ascending ids in parameter order, so sort instead
+        new_ids = sorted(self.db.execute(
+            insert(model).returning(model.id),
+            [row for _, _, row in pending]
+        ).scalars().all())
+        for (_, source_id, _), new_id in zip(pending, new_ids):
+            if source_id is not None:
+                ids[source_id] = new_id
+        return new_ids
+
+    def _flush_projects(self):
+        pending = self._take("project")
+        if not pending:
+            return
+        new_ids = self._insert_with_ids(Project, pending, self.project_ids)
+        self.db.execute(insert(ProjectAccess), [
+            {"user_id": self.owner_id, "project_id": project_id, "role": AccessRole.OWNER} for project_id in new_ids
+        ])
+        for project_id in new_ids:
+            change_crud.record(self.db, project_id, ChangeEntity.PROJECT, ChangeOp.INSERT, [project_id])
+        self.db.commit()
+        self.summary.projects += len(new_ids)
+
+    def _flush_tasks(self):
+        pending = self._remap(self._take("task"), "project_id", self.project_ids, "project")
+        if not pending:
+            return
+        # Assignees from another system are kept only if the user exists here
+        existing = user_crud.get_existing_ids(db=self.db, user_ids={
+            row["assigned_user_id"] for _, _, row in pending if row["assigned_user_id"] is not None
+        })
+        for _, _, row in pending:
+            if row["assigned_user_id"] not in existing:
+                row["assigned_user_id"] = None
+        new_ids = self._insert_with_ids(Task, pending, self.task_ids)
+        project_task_ids: Dict[int, List[int]] = {}
+        for (_, _, row), task_id in zip(pending, new_ids):
+            self.task_projects[task_id] = row["project_id"]
+            project_task_ids.setdefault(row["project_id"], []).append(task_id)
+        self._record_created(project_task_ids, ChangeEntity.TASK, "tasks.created", "task_ids")
+        stats_crud.record_tasks(self.db, [
+            (row["project_id"], row["status"], row["assigned_user_id"], 1) for _, _, row in pending
+        ])
+        self.db.commit()
+        self.summary.tasks += len(pending)
+
+    def _flush_comments(self):
+        pending = self._remap(self._take("comment"), "task_id", self.task_ids, "task")
+        if not pending:
+            return
+        existing = user_crud.get_existing_ids(db=self.db, user_ids={
+            row["author_id"] for _, _, row in pending if row["author_id"] is not None
+        })
+        rows = [{**row, "author_id": row["author_id"] if row["author_id"] in existing else self.owner_id}
+                for _, _, row in pending]
+        inserted = self.db.execute(insert(Comment).returning(Comment.id, Comment.task_id), rows).all()
+        project_comment_ids: Dict[int, List[int]] = {}
+        for comment_id, task_id in inserted:
+            project_comment_ids.setdefault(self.task_projects[task_id], []).append(comment_id)
+        self._record_created(project_comment_ids, ChangeEntity.COMMENT, "comments.created", "comment_ids")
+        stats_crud.record_comments(self.db, {project_id: len(ids) for project_id, ids in project_comment_ids.items()})
+        self.db.commit()
+        self.summary.comments += len(rows)
+
+    def _record_created(self, project_ids: Dict[int, List[int]], entity: ChangeEntity, event_type: str, key: str):
+        # One event per project and chunk, as for batch task creation
+        for project_id, entity_ids in project_ids.items():
+            entity_ids = sorted(entity_ids)
+            project_crud.touch(self.db, project_id)
+            publish_on_commit(self.db, project_id, event_type, **{key: entity_ids})
+            change_crud.record(self.db, project_id, entity, ChangeOp.INSERT, entity_ids)
+
+class ImportCRUD:
+    def import_records(self, db: Session, stream: TextIO, fmt: str, owner_id: int,
+                       chunk_size: int = None) -> ImportSummary:
+        """Import projects, tasks and comments from an NDJSON or CSV stream, committing in chunks.
+
+        Records reference each other by their source ids (a task's ``project_id``,
+        a comment's ``task_id``), so parents must come before their children, as
+        they do in project exports. Imported projects are owned by ``owner_id``.
+        """
+        run = _ImportRun(db, owner_id, chunk_size or settings.IMPORT_CHUNK_SIZE)
+        for line, record in iter_records(stream, fmt):
+            run.add(line, record)
+        run.flush_all()
+        return run.summary
+
+import_crud = ImportCRUD()
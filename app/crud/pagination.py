@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_, DateTime
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+class InvalidCursor(ValueError):
+    pass
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_value(column, value):
+    # Cursors come from clients, so every value must have the column's type
+    # before it is bound into the keyset comparison
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:  # e.g. a computed ranking expression
+        expected = float
+    if expected is float:
+        expected = (int, float)
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise ValueError
+    return value
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidCursor(f"Invalid pagination cursor '{cursor}'")
+
+def _after(columns: Sequence, values: Sequence):
+    # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y), spelled out so each
+    # comparison binds with the column's own type
+    column, value = columns[0], values[0]
+    if len(columns) == 1:
+        return column > value
+    return or_(column > value, and_(column == value, _after(columns[1:], values[1:])))
+
+def paginate(query, columns: Sequence, limit: int, after: Optional[str] = None) -> Page:
+    """Keyset-paginate a query ordered by ``columns``, fetching one row past the page to detect the end."""
+    if after:
+        query = query.filter(_after(columns, decode_cursor(after, columns)))
+    rows = query.order_by(*columns).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(rows)
+    last = rows[limit - 1]
+    return Page(rows[:limit], encode_cursor([getattr(last, column.key) for column in columns]))
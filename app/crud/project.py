@@ -1,13 +1,52 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import delete, event, exists, insert, literal, select, update
+from sqlalchemy.orm import Session, joinedload
 from typing import List
+from ..core.events import publish_on_commit
+from ..core.response_cache import response_cache
+from ..core.serialization import RowSerializer
 from ..models.project import Project
 from ..models.user import User
-from ..schemas.project import ProjectCreate, ProjectUpdate
+from ..models.access_rights import ProjectAccess, AccessRole
+from ..models.change import ChangeEntity, ChangeOp
+from ..schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from ..schemas.user import UserResponse
+from .access import access_crud
+from .changes import change_crud
+from .stats import stats_crud
+from .pagination import Page, paginate
+
+TOUCHED_PROJECTS = "touched_projects"
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_touched_projects(session: Session):
+    for project_id in session.info.pop(TOUCHED_PROJECTS, ()):
+        response_cache.invalidate_project(project_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_touched_projects(session: Session):
+    session.info.pop(TOUCHED_PROJECTS, None)
 
 class ProjectCRUD:
+    page_order = (Project.created_at, Project.id)
+    row_serializer = RowSerializer(ProjectResponse, Project, owner=(UserResponse, User))
+
+    def _response_query(self, db: Session, rows: RowSerializer = None):
+        if rows is not None:
+            # Flat rows laid out for a subset of row_serializer, selecting only the columns it needs
+            query = db.query(*rows.select_columns(*self.page_order)).select_from(Project)
+            if rows.includes("owner"):
+                query = query.join(User, Project.owner_id == User.id)
+            return query
+        # Eagerly load the relationships embedded in ProjectResponse
+        return db.query(Project).options(joinedload(Project.owner))
+
     def create(self, db: Session, project_create: ProjectCreate, owner_id: int) -> Project:
         db_project = Project(**project_create.model_dump(), owner_id=owner_id)
+        db_project.access_rights.append(ProjectAccess(user_id=owner_id, role=AccessRole.OWNER))
         db.add(db_project)
+        db.flush()
+        change_crud.record(db, db_project.id, ChangeEntity.PROJECT, ChangeOp.INSERT, [db_project.id])
         db.commit()
         db.refresh(db_project)
         return db_project
@@ -15,32 +54,122 @@ class ProjectCRUD:
     def get_by_id(self, db: Session, project_id: int) -> Project:
         return db.query(Project).filter(Project.id == project_id).first()
 
-    def get_user_projects(self, db: Session, user_id: int) -> List[Project]:
-        return db.query(Project).filter(
-            (Project.owner_id == user_id) | 
-            (Project.contributors.any(User.id == user_id))
-        ).all()
+    def get_version(self, db: Session, project_id: int) -> int:
+        return db.execute(select(Project.version).where(Project.id == project_id)).scalar()
+
+    def touch(self, db: Session, project_id) -> List[int]:
+        """Bump the project's version in the caller's transaction; call it from every write that changes what the project's reads return.
+
+        ``project_id`` may be a scalar subquery when only a child row's id is known.
+        Cached responses of the project are dropped once the transaction commits.
+        Returns the ids of the projects touched.
+        """
+        touched = db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(version=Project.version + 1, updated_at=datetime.utcnow())
+            .returning(Project.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        db.info.setdefault(TOUCHED_PROJECTS, set()).update(touched)
+        return touched
+
+    def get_user_projects(self, db: Session, user_id: int, limit: int, after: str = None, rows: RowSerializer = None) -> Page:
+        query = self._response_query(db, rows).filter(Project.id.in_(access_crud.visible_project_ids(user_id)))
+        return paginate(query, self.page_order, limit, after)
 
     def get_projects_by_user_id(self, db: Session, user_id: int) -> List[Project]:
-        return db.query(Project).filter(
-            (Project.owner_id == user_id) | 
-            (Project.contributors.any(User.id == user_id))
-        ).all()
+        return self._response_query(db).filter(Project.id.in_(access_crud.visible_project_ids(user_id))).all()
+
+    def get_shared_projects(self, db: Session, user_id: int, viewer_id: int, limit: int, after: str = None,
+                            rows: RowSerializer = None) -> Page:
+        query = self._response_query(db, rows).filter(
+            Project.id.in_(access_crud.visible_project_ids(user_id)),
+            Project.id.in_(access_crud.visible_project_ids(viewer_id))
+        )
+        return paginate(query, self.page_order, limit, after)
+
+    def get_contributors(self, db: Session, project_id: int, limit: int, after: str = None) -> Page:
+        query = db.query(User).join(ProjectAccess, ProjectAccess.user_id == User.id).filter(
+            ProjectAccess.project_id == project_id,
+            ProjectAccess.role == AccessRole.CONTRIBUTOR
+        )
+        return paginate(query, (User.id,), limit, after)
 
     def update(self, db: Session, project: Project, project_update: ProjectUpdate) -> Project:
         for field, value in project_update.model_dump(exclude_unset=True).items():
             setattr(project, field, value)
+        project.version = Project.version + 1
+        db.info.setdefault(TOUCHED_PROJECTS, set()).add(project.id)
+        publish_on_commit(db, project.id, "project.updated")
+        change_crud.record(db, project.id, ChangeEntity.PROJECT, ChangeOp.UPDATE, [project.id])
+        access_crud.invalidate_project_on_commit(db, project.id)
         db.commit()
         db.refresh(project)
         return project
 
     def add_contributor(self, db: Session, project: Project, user: User):
-        if user not in project.contributors:
-            project.contributors.append(user)
-            db.commit()
+        self.add_contributors(db, project.id, [user.id])
+
+    def add_contributors(self, db: Session, project_id: int, user_ids: List[int]) -> List[int]:
+        """Add existing users as contributors, skipping current ones; returns the ids added.
+
+        The membership test is an anti-join against project_access, so the cost
+        depends on the users being added, not on the size of the team.
+        """
+        if not user_ids:
+            return []
+        already_member = exists().where(
+            ProjectAccess.project_id == project_id,
+            ProjectAccess.user_id == User.id,
+            ProjectAccess.role == AccessRole.CONTRIBUTOR
+        )
+        new_members = select(
+            User.id,
+            literal(project_id),
+            literal(AccessRole.CONTRIBUTOR, ProjectAccess.role.type)
+        ).where(User.id.in_(set(user_ids)), ~already_member)
+        added = db.execute(
+            insert(ProjectAccess)
+            .from_select(["user_id", "project_id", "role"], new_members)
+            .returning(ProjectAccess.user_id)
+        ).scalars().all()
+        if added:
+            self.touch(db, project_id)
+            publish_on_commit(db, project_id, "contributors.added", user_ids=sorted(added))
+            change_crud.record(db, project_id, ChangeEntity.CONTRIBUTOR, ChangeOp.INSERT, sorted(added))
+            access_crud.invalidate_project_on_commit(db, project_id)
+        db.commit()
+        return sorted(added)
+
+    def remove_contributors(self, db: Session, project_id: int, user_ids: List[int]) -> List[int]:
+        if not user_ids:
+            return []
+        removed = db.execute(
+            delete(ProjectAccess)
+            .where(
+                ProjectAccess.project_id == project_id,
+                ProjectAccess.role == AccessRole.CONTRIBUTOR,
+                ProjectAccess.user_id.in_(set(user_ids))
+            )
+            .returning(ProjectAccess.user_id)
+        ).scalars().all()
+        if removed:
+            self.touch(db, project_id)
+            publish_on_commit(db, project_id, "contributors.removed", user_ids=sorted(removed))
+            change_crud.record(db, project_id, ChangeEntity.CONTRIBUTOR, ChangeOp.DELETE, sorted(removed))
+            access_crud.invalidate_project_on_commit(db, project_id)
+        db.commit()
+        return sorted(removed)
     
     def delete(self, db: Session, project: Project):
+        project_id = project.id
+        stats_crud.delete_project(db, project_id)
+        change_crud.delete_project(db, project_id)
         db.delete(project)
+        publish_on_commit(db, project_id, "project.deleted")
         db.commit()
+        access_crud.invalidate_project(project_id)
+        response_cache.invalidate_project(project_id)
 
 project_crud = ProjectCRUD()
\ No newline at end of file
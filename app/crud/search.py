@@ -0,0 +1,66 @@
+import re
+from sqlalchemy import Integer, column, func, literal_column, table
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..core.config import settings
+from ..models.search import SEARCH_TABLE
+from ..models.task import Task
+from .access import access_crud
+from .pagination import Page, paginate
+
+search_index = table(
+    SEARCH_TABLE,
+    column("rowid", Integer),
+    column("kind"),
+    column("ref_id", Integer),
+    column("task_id", Integer),
+    column("project_id", Integer),
+)
+
+class InvalidSearchQuery(ValueError):
+    pass
+
+def match_expression(q: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted so FTS5 operators and punctuation in user input are taken literally.
+    """
+    terms = [term.replace('"', '""') for term in re.findall(r"[^\s\"]+", q)]
+    if not terms:
+        raise InvalidSearchQuery("Search query must contain at least one word")
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+class SearchCRUD:
+    # bm25 is lower for better matches, so ascending order puts the best first;
+    # rowid breaks ties and makes the order a usable pagination key
+    score = func.bm25(literal_column(SEARCH_TABLE), settings.SEARCH_TITLE_WEIGHT, 1.0).label("score")
+    page_order = (score, search_index.c.rowid)
+
+    def search(self, db: Session, q: str, user_id: int, limit: int, after: str = None,
+               project_id: Optional[int] = None) -> Page:
+        """Tasks and comments matching ``q`` in the projects the user owns or contributes to, best first."""
+        snippet = func.snippet(
+            literal_column(SEARCH_TABLE), -1, "[", "]", "…", settings.SEARCH_SNIPPET_TOKENS
+        ).label("snippet")
+        query = (
+            db.query(
+                search_index.c.kind,
+                search_index.c.ref_id.label("id"),
+                search_index.c.task_id,
+                search_index.c.project_id,
+                Task.title.label("task_title"),
+                snippet,
+                *self.page_order,
+            )
+            .select_from(search_index)
+            .join(Task, Task.id == search_index.c.task_id)
+            .filter(
+                literal_column(SEARCH_TABLE).op("MATCH")(match_expression(q)),
+                search_index.c.project_id.in_(access_crud.visible_project_ids(user_id))
+            )
+        )
+        if project_id is not None:
+            query = query.filter(search_index.c.project_id == project_id)
+        return paginate(query, self.page_order, limit, after)
+
+search_crud = SearchCRUD()
@@ -0,0 +1,141 @@
+from collections import Counter, defaultdict
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.comment import Comment
+from ..models.project import Project
+from ..models.stats import ProjectStats, ProjectAssigneeStats
+from ..models.task import Task, TaskStatus
+
+STATUS_COUNTS = {
+    TaskStatus.TODO: "todo_count",
+    TaskStatus.IN_PROGRESS: "in_progress_count",
+    TaskStatus.DONE: "done_count",
+}
+
+# (project_id, status, assigned_user_id, delta)
+TaskCountChange = Tuple[int, TaskStatus, Optional[int], int]
+
+class StatsCRUD:
+    """Maintains project_stats and project_assignee_stats.
+
+    The record_* methods only execute statements; they run inside the caller's
+    transaction so counters commit (or roll back) together with the write.
+    """
+
+    def get(self, db: Session, project_id: int) -> dict:
+        """Counters of one project: a primary-key lookup plus one row per assignee."""
+        stats = db.get(ProjectStats, project_id)
+        assignees = db.execute(
+            select(ProjectAssigneeStats.user_id, ProjectAssigneeStats.task_count, ProjectAssigneeStats.done_count)
+            .where(ProjectAssigneeStats.project_id == project_id, ProjectAssigneeStats.task_count > 0)
+            .order_by(ProjectAssigneeStats.user_id)
+        ).all()
+        by_status = {status.value: getattr(stats, column, 0) if stats else 0 for status, column in STATUS_COUNTS.items()}
+        return {
+            "project_id": project_id,
+            "task_count": sum(by_status.values()),
+            "tasks_by_status": by_status,
+            "assignees": [row._asdict() for row in assignees],
+            "comment_count": stats.comment_count if stats else 0,
+        }
+
+    def record_tasks(self, db: Session, changes: Iterable[TaskCountChange]):
+        projects: Dict[int, Counter] = defaultdict(Counter)
+        assignees: Dict[Tuple[int, int], Counter] = defaultdict(Counter)
+        for project_id, status, assigned_user_id, delta in changes:
+            projects[project_id][STATUS_COUNTS[status]] += delta
+            if assigned_user_id is not None:
+                assignees[(project_id, assigned_user_id)]["task_count"] += delta
+                assignees[(project_id, assigned_user_id)]["done_count"] += delta if status == TaskStatus.DONE else 0
+
+        self._add(db, ProjectStats, ("project_id",), list(STATUS_COUNTS.values()), [
+            {"project_id": project_id, **{column: counts[column] for column in STATUS_COUNTS.values()}}
+            for project_id, counts in projects.items() if any(counts.values())
+        ])
+        self._add(db, ProjectAssigneeStats, ("project_id", "user_id"), ["task_count", "done_count"], [
+            {"project_id": project_id, "user_id": user_id, "task_count": counts["task_count"], "done_count": counts["done_count"]}
+            for (project_id, user_id), counts in assignees.items() if any(counts.values())
+        ])
+
+    def record_comments(self, db: Session, counts: Dict[int, int]):
+        """Add ``counts[project_id]`` (possibly negative) to each project's comment total."""
+        self._add(db, ProjectStats, ("project_id",), ["comment_count"], [
+            {"project_id": project_id, **{column: 0 for column in STATUS_COUNTS.values()}, "comment_count": delta}
+            for project_id, delta in counts.items() if delta
+        ])
+
+    def _add(self, db: Session, model, keys: Tuple[str, ...], columns: List[str], rows: List[dict]):
+        # Upsert that adds to the stored counters, creating the row on first use
+        if not rows:
+            return
+        stmt = sqlite_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: getattr(model, column) + stmt.excluded[column] for column in columns}
+        )
+        db.execute(stmt, rows)
+
+    def delete_project(self, db: Session, project_id: int):
+        db.execute(delete(ProjectStats).where(ProjectStats.project_id == project_id))
+        db.execute(delete(ProjectAssigneeStats).where(ProjectAssigneeStats.project_id == project_id))
+
+    def rebuild(self, db, project_id: int = None) -> int:
+        """Recompute counters from tasks and comments, for one project or all; returns the projects rebuilt.
+
+        ``db`` may be a Session or a Connection, so migrations can backfill with it too.
+        """
+        projects = select(Project.id)
+        if project_id is not None:
+            projects = projects.where(Project.id == project_id)
+        project_ids = projects.scalar_subquery()
+        db.execute(delete(ProjectStats).where(ProjectStats.project_id.in_(project_ids)))
+        db.execute(delete(ProjectAssigneeStats).where(ProjectAssigneeStats.project_id.in_(project_ids)))
+
+        task_counts = (
+            select(Task.project_id, *[
+                func.sum(case((Task.status == status, 1), else_=0)).label(column)
+                for status, column in STATUS_COUNTS.items()
+            ])
+            .where(Task.project_id.in_(project_ids))
+            .group_by(Task.project_id)
+            .subquery()
+        )
+        comment_counts = (
+            select(Task.project_id, func.count(Comment.id).label("comment_count"))
+            .join(Comment, Comment.task_id == Task.id)
+            .where(Task.project_id.in_(project_ids))
+            .group_by(Task.project_id)
+            .subquery()
+        )
+        columns = list(STATUS_COUNTS.values())
+        rebuilt = db.execute(
+            insert(ProjectStats).from_select(
+                ["project_id", *columns, "comment_count"],
+                select(
+                    Project.id,
+                    *[func.coalesce(task_counts.c[column], 0) for column in columns],
+                    func.coalesce(comment_counts.c.comment_count, 0)
+                )
+                .outerjoin(task_counts, task_counts.c.project_id == Project.id)
+                .outerjoin(comment_counts, comment_counts.c.project_id == Project.id)
+                .where(Project.id.in_(project_ids))
+            )
+        ).rowcount
+        db.execute(
+            insert(ProjectAssigneeStats).from_select(
+                ["project_id", "user_id", "task_count", "done_count"],
+                select(
+                    Task.project_id,
+                    Task.assigned_user_id,
+                    func.count(Task.id),
+                    func.sum(case((Task.status == TaskStatus.DONE, 1), else_=0))
+                )
+                .where(Task.project_id.in_(project_ids), Task.assigned_user_id.is_not(None))
+                .group_by(Task.project_id, Task.assigned_user_id)
+            )
+        )
+        return rebuilt
+
+stats_crud = StatsCRUD()
@@ -1,37 +1,163 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session, aliased, joinedload
 from typing import List
+from ..core.events import publish_on_commit
+from ..core.serialization import RowSerializer
+from ..models.change import ChangeEntity, ChangeOp
+from ..models.comment import Comment
 from ..models.task import Task, TaskStatus
-from ..schemas.task import TaskCreate, TaskUpdate
+from ..models.user import User
+from ..schemas.task import TaskCreate, TaskUpdate, TaskFilter, TaskResponse
+from ..schemas.user import UserResponse
+from .access import access_crud
+from .changes import change_crud
+from .project import project_crud
+from .stats import stats_crud
+from .pagination import Page, paginate
+
+_assignee = aliased(User)
 
 class TaskCRUD:
+    page_order = (Task.created_at, Task.id)
+    row_serializer = RowSerializer(TaskResponse, Task, assigned_user=(UserResponse, _assignee))
+
+    def _response_query(self, db: Session, rows: RowSerializer = None):
+        if rows is not None:
+            # Flat rows laid out for a subset of row_serializer, selecting only the columns it needs
+            query = db.query(*rows.select_columns(*self.page_order)).select_from(Task)
+            if rows.includes("assigned_user"):
+                query = query.outerjoin(_assignee, Task.assigned_user_id == _assignee.id)
+            return query
+        # Eagerly load the relationships embedded in TaskResponse
+        return db.query(Task).options(joinedload(Task.assigned_user))
+
     def create(self, db: Session, task_create: TaskCreate) -> Task:
         db_task = Task(**task_create.model_dump())
         db.add(db_task)
+        db.flush()
+        project_crud.touch(db, db_task.project_id)
+        stats_crud.record_tasks(db, [(db_task.project_id, db_task.status, db_task.assigned_user_id, 1)])
+        publish_on_commit(db, db_task.project_id, "task.created", task_id=db_task.id)
+        change_crud.record(db, db_task.project_id, ChangeEntity.TASK, ChangeOp.INSERT, [db_task.id])
         db.commit()
         db.refresh(db_task)
         return db_task
 
+    def validate_create(self, task_create: TaskCreate) -> dict:
+        """Run the Task model validators without a session; returns the normalized column values."""
+        task = Task(**task_create.model_dump())
+        return {field: getattr(task, field) for field in TaskCreate.model_fields}
+
+    def create_many(self, db: Session, rows: List[dict]) -> List[Task]:
+        """Insert validated task rows with one executemany in a single transaction."""
+        inserted = db.execute(insert(Task).returning(Task.id, Task.project_id), rows).all()
+        task_ids = [row.id for row in inserted]
+        for project_id in {row["project_id"] for row in rows}:
+            project_task_ids = sorted(row.id for row in inserted if row.project_id == project_id)
+            project_crud.touch(db, project_id)
+            publish_on_commit(db, project_id, "tasks.created", task_ids=project_task_ids)
+            change_crud.record(db, project_id, ChangeEntity.TASK, ChangeOp.INSERT, project_task_ids)
+        stats_crud.record_tasks(db, [(row["project_id"], row.get("status", TaskStatus.TODO), row["assigned_user_id"], 1) for row in rows])
+        db.commit()
+        return self._response_query(db).filter(Task.id.in_(task_ids)).order_by(Task.id).all()
+
     def get_by_id(self, db: Session, task_id: int) -> Task:
-        return db.query(Task).filter(Task.id == task_id).first()
+        return self._response_query(db).filter(Task.id == task_id).first()
+
+    def get_by_ids(self, db: Session, task_ids: List[int]) -> List[Task]:
+        return self._response_query(db).filter(Task.id.in_(task_ids)).order_by(Task.id).all() if task_ids else []
 
-    def get_by_project(self, db: Session, project_id: int) -> List[Task]:
-        return db.query(Task).filter(Task.project_id == project_id).all()
+    def get_by_project(self, db: Session, project_id: int, limit: int, after: str = None, rows: RowSerializer = None) -> Page:
+        query = self._response_query(db, rows).filter(Task.project_id == project_id)
+        return paginate(query, self.page_order, limit, after)
 
     def get_by_user(self, db: Session, user_id: int) -> List[Task]:
-        return db.query(Task).filter(Task.assigned_user_id == user_id).all()
+        return self._response_query(db).filter(Task.assigned_user_id == user_id).all()
 
     def get_by_status(self, db: Session, status: TaskStatus) -> List[Task]:
-        return db.query(Task).filter(Task.status == status).all()
+        return self._response_query(db).filter(Task.status == status).all()
+
+    def get_visible_by_user(self, db: Session, user_id: int, viewer_id: int, limit: int, after: str = None,
+                            rows: RowSerializer = None) -> Page:
+        query = self._response_query(db, rows).filter(
+            Task.assigned_user_id == user_id,
+            Task.project_id.in_(access_crud.visible_project_ids(viewer_id))
+        )
+        return paginate(query, self.page_order, limit, after)
+
+    def get_visible_by_status(self, db: Session, status: TaskStatus, viewer_id: int, limit: int, after: str = None,
+                              rows: RowSerializer = None) -> Page:
+        query = self._response_query(db, rows).filter(
+            Task.status == status,
+            Task.project_id.in_(access_crud.visible_project_ids(viewer_id))
+        )
+        return paginate(query, self.page_order, limit, after)
 
     def update(self, db: Session, task: Task, task_update: TaskUpdate) -> Task:
+        before = (task.project_id, task.status, task.assigned_user_id, -1)
         for field, value in task_update.model_dump(exclude_unset=True).items():
             setattr(task, field, value)
+        task.version = Task.version + 1
+        project_crud.touch(db, task.project_id)
+        stats_crud.record_tasks(db, [before, (task.project_id, task.status, task.assigned_user_id, 1)])
+        publish_on_commit(db, task.project_id, "task.updated", task_id=task.id)
+        change_crud.record(db, task.project_id, ChangeEntity.TASK, ChangeOp.UPDATE, [task.id])
         db.commit()
         db.refresh(task)
         return task
 
+    def validate_update(self, task_update: TaskUpdate) -> dict:
+        """Run the Task model validators on the fields a patch sets; returns the normalized values."""
+        task = Task()
+        values = task_update.model_dump(exclude_unset=True)
+        for field, value in values.items():
+            setattr(task, field, value)
+        return {field: getattr(task, field) for field in values}
+
+    def update_many(self, db: Session, project_id: int, values: dict, task_ids: List[int] = None,
+                    task_filter: TaskFilter = None) -> List[int]:
+        """Apply validated values to the selected tasks of a project in one UPDATE; returns the ids changed."""
+        criteria = [Task.project_id == project_id]
+        if task_ids is not None:
+            criteria.append(Task.id.in_(task_ids))
+        if task_filter is not None:
+            # An explicit null matches unset columns, e.g. unassigned tasks
+            for field, value in task_filter.model_dump(exclude_unset=True).items():
+                column = getattr(Task, field)
+                criteria.append(column.is_(None) if value is None else column == value)
+
+        # Counters move from the old (status, assignee) groups to the new ones
+        before = db.execute(
+            select(Task.status, Task.assigned_user_id, func.count()).where(*criteria)
+            .group_by(Task.status, Task.assigned_user_id)
+        ).all()
+        values = {**values, "version": Task.version + 1, "updated_at": datetime.utcnow()}
+        updated = db.execute(
+            update(Task).where(*criteria).values(**values).returning(Task.id, Task.status, Task.assigned_user_id)
+        ).all()
+        updated_ids = sorted(row.id for row in updated)
+        if updated:
+            project_crud.touch(db, project_id)
+            stats_crud.record_tasks(db, [
+                *[(project_id, status, assigned_user_id, -count) for status, assigned_user_id, count in before],
+                *[(project_id, row.status, row.assigned_user_id, 1) for row in updated]
+            ])
+            publish_on_commit(db, project_id, "tasks.updated", task_ids=updated_ids)
+            change_crud.record(db, project_id, ChangeEntity.TASK, ChangeOp.UPDATE, updated_ids)
+        db.commit()
+        return updated_ids
+
     def delete(self, db: Session, task: Task):
+        """Delete a task together with its comments."""
+        project_crud.touch(db, task.project_id)
+        deleted_comments = db.execute(delete(Comment).where(Comment.task_id == task.id).returning(Comment.id)).scalars().all()
+        stats_crud.record_tasks(db, [(task.project_id, task.status, task.assigned_user_id, -1)])
+        stats_crud.record_comments(db, {task.project_id: -len(deleted_comments)})
+        publish_on_commit(db, task.project_id, "task.deleted", task_id=task.id)
+        change_crud.record(db, task.project_id, ChangeEntity.COMMENT, ChangeOp.DELETE, sorted(deleted_comments))
+        change_crud.record(db, task.project_id, ChangeEntity.TASK, ChangeOp.DELETE, [task.id])
         db.delete(task)
         db.commit()
 
-task_crud = TaskCRUD()
\ No newline at end of file
+task_crud = TaskCRUD()
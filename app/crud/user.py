@@ -1,11 +1,14 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from typing import Iterable, Set
 from ..models.user import User
 from ..schemas.user import UserCreate
-from ..core.security import get_password_hash
+from ..core.security import get_password_hash, invalidate_principal
 
 class UserCRUD:
-    def create(self, db: Session, user_create: UserCreate) -> User:
-        hashed_password = get_password_hash(user_create.password)
+    def create(self, db: Session, user_create: UserCreate, hashed_password: str = None) -> User:
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_create.password)
         db_user = User(
             username=user_create.username,
             email=user_create.email,
@@ -25,4 +28,18 @@ class UserCRUD:
     def get_by_id(self, db: Session, user_id: int) -> User:
         return db.query(User).filter(User.id == user_id).first()
 
+    def get_existing_ids(self, db: Session, user_ids: Iterable[int]) -> Set[int]:
+        return set(db.execute(select(User.id).where(User.id.in_(set(user_ids)))).scalars())
+
+    def update_password_hash(self, db: Session, user_id: int, hashed_password: str):
+        db.query(User).filter(User.id == user_id).update({User.hashed_password: hashed_password})
+        db.commit()
+
+    def deactivate(self, db: Session, user: User) -> User:
+        user.is_active = False
+        db.commit()
+        invalidate_principal(user.id)
+        db.refresh(user)
+        return user
+
 user_crud = UserCRUD()
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""
+Group commit for SQLite writes.
+
+SQLite takes one write lock per database, so concurrent requests that each
+commit their own transaction queue on the lock and pay one fsync apiece. With
+GROUP_COMMIT enabled, write endpoints hand their work to a single writer
+thread instead. The writer collects the units submitted within
+GROUP_COMMIT_WINDOW_MS (at most GROUP_COMMIT_MAX_BATCH of them), runs each in
+its own SAVEPOINT of one shared transaction, commits once, and only then
+returns each caller its result. A unit that fails is rolled back to its
+savepoint and its caller gets the exception; the rest of the batch commits.
+If the writer thread itself fails, every waiting caller gets the error and
+the writer is replaced on the next write.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from ..core.config import settings
+
+IN_UNIT = "group_commit_unit"
+
+class GroupCommitSession(Session):
+    """Session of the writer thread, on which the units of a batch run.
+
+    The CRUD methods commit when they are done; inside a unit that commit only
+    flushes, because the writer commits the whole batch.
+    """
+
+    def commit(self):
+        if self.info.get(IN_UNIT):
+            self.flush()
+        else:
+            super().commit()
+
+class WriteUnit(NamedTuple):
+    work: Callable[[Session], Any]
+    render: Optional[Callable[[Any], Any]]
+    future: Future
+
+class GroupCommitWriter:
+    """Single writer thread committing the units of a batch in one transaction.
+
+    The writer keeps one connection of ``bind`` for its lifetime. The database
+    must be a file (an in-memory database behind a StaticPool shares its only
+    connection with every session).
+    """
+
+    def __init__(self, bind: Engine, window_ms: float = None, max_batch: int = None):
+        self.bind = bind
+        self.window = (settings.GROUP_COMMIT_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self.max_batch = max_batch or settings.GROUP_COMMIT_MAX_BATCH
+        self.units = 0
+        self.batches = 0
+        self.failures = 0
+        self.error: Optional[Exception] = None
+        self._queue: "queue.Queue[Optional[WriteUnit]]" = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, work: Callable[[Session], Any], render: Callable[[Any], Any] = None) -> Any:
+        """Run ``work(session)`` in the next batch and wait for the batch to commit.
+
+        ``render`` turns the unit's result into something that outlives the
+        writer's session (e.g. a response model); it runs on the writer thread
+        right after the unit, while lazy relationships can still load.
+        """
+        unit = WriteUnit(work, render, Future())
+        with self._submit_lock:
+            if self.error is not None:
+                raise RuntimeError("The group commit writer has stopped") from self.error
+            self._queue.put(unit)
+        return unit.future.result()
+
+    @property
+    def alive(self) -> bool:
+        return self.error is None and self._thread.is_alive()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: WriteUnit) -> List[WriteUnit]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                unit = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if unit is None:
+                self._queue.put(None)
+                break
+            batch.append(unit)
+        return batch
+
+    def _run(self):
+        batch: List[WriteUnit] = []
+        try:
+            self._write_batches(batch)
+        except Exception as e:
+            self._fail(batch, e)
+        else:
+            self._fail(batch, RuntimeError("The group commit writer was closed"))
+
+    def _write_batches(self, batch: List[WriteUnit]):
+        # ``batch`` holds the units in flight, for _run to fail if this raises
+        with self.bind.connect() as connection:
+            # pysqlite only sends BEGIN before the first INSERT/UPDATE/DELETE, so a
+            # SAVEPOINT issued first would open (and its RELEASE commit) a
+            # transaction of its own. The writer's connection is put in driver
+            # autocommit mode and begins every transaction explicitly instead;
+            # IMMEDIATE takes the write lock up front rather than on first write.
+            driver_connection = connection.connection.driver_connection
+            isolation_level = driver_connection.isolation_level
+            driver_connection.isolation_level = None
+            begin_immediate = lambda conn: conn.exec_driver_sql("BEGIN IMMEDIATE")
+            event.listen(connection, "begin", begin_immediate)
+            try:
+                while True:
+                    first = self._queue.get()
+                    if first is None:
+                        return
+                    batch[:] = self._collect(first)
+                    self._commit_batch(connection, batch)
+                    batch.clear()
+            finally:
+                event.remove(connection, "begin", begin_immediate)
+                driver_connection.isolation_level = isolation_level
+
+    def _fail(self, batch: List[WriteUnit], error: Exception):
+        # Callers of the batch in flight and of every queued unit would wait
+        # forever on a thread that is gone; hand them the error instead
+        with self._submit_lock:
+            self.error = error
+            units = [unit for unit in batch if not unit.future.done()]
+            while True:
+                try:
+                    unit = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if unit is not None:
+                    units.append(unit)
+        self.failures += len(units)
+        for unit in units:
+            unit.future.set_exception(error)
+
+    def _commit_batch(self, connection: Connection, batch: List[WriteUnit]):
+        session = GroupCommitSession(bind=connection, autoflush=False)
+        results: List[tuple] = []
+        try:
+            for unit in batch:
+                results.append(self._run_unit(session, unit))
+            session.commit()
+        except Exception as e:  # the shared commit failed: no unit was written
+            session.rollback()
+            # A failed COMMIT (SQLITE_BUSY, I/O error) can leave SQLite's
+            # transaction open after SQLAlchemy has let go of it
+            driver_connection = connection.connection.driver_connection
+            if driver_connection.in_transaction:
+                driver_connection.rollback()
+            results = [(None, e)] * len(batch)
+        finally:
+            session.close()
+        self.units += len(batch)
+        self.batches += 1
+        for unit, (result, error) in zip(batch, results):
+            if error is not None:
+                self.failures += 1
+                unit.future.set_exception(error)
+            else:
+                unit.future.set_result(result)
+
+    def _run_unit(self, session: GroupCommitSession, unit: WriteUnit) -> tuple:
+        # Work a unit queues for after the commit (cache invalidation, events)
+        # must not survive its rollback, so session.info is restored on failure
+        saved_info = {key: value.copy() if hasattr(value, "copy") else value
+                      for key, value in session.info.items()}
+        savepoint = session.begin_nested()
+        session.info[IN_UNIT] = True
+        try:
+            result = unit.work(session)
+            if unit.render is not None:
+                result = unit.render(result)
+            savepoint.commit()
+            return result, None
+        except Exception as e:
+            savepoint.rollback()
+            session.info.clear()
+            session.info.update(saved_info)
+            return None, e
+        finally:
+            session.info.pop(IN_UNIT, None)
+
+    def stats(self) -> dict:
+        return {"units": self.units, "batches": self.batches, "failures": self.failures}
+
+_writers: Dict[Engine, GroupCommitWriter] = {}
+_writers_lock = threading.Lock()
+
+def writer_for(bind: Engine) -> GroupCommitWriter:
+    with _writers_lock:
+        writer = _writers.get(bind)
+        if writer is None or not writer.alive:
+            writer = _writers[bind] = GroupCommitWriter(bind)
+        return writer
+
+def shutdown_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+def run_write(db: Session, work: Callable[[Session], Any], adapter: TypeAdapter = None) -> Any:
+    """Run a write endpoint's unit of work, grouped with others when GROUP_COMMIT is on.
+
+    ``work`` receives the session to write with: the request's own session, or
+    the writer's. It must not use ORM objects loaded by the request session;
+    reload them by id. With ``adapter`` the result is validated into the
+    response model, so it can leave the writer thread.
+    """
+    if not settings.GROUP_COMMIT:
+        return work(db)
+    render = (lambda result: adapter.validate_python(result, from_attributes=True)) if adapter is not None else None
+    return writer_for(db.get_bind()).submit(work, render)
@@ -0,0 +1,116 @@
+"""
+Versioned, non-destructive schema migrations.
+
+Each migration runs once per database, in version order, and is recorded in
+the ``schema_version`` table. Migrations must be idempotent against a database
+created from the current models (migration 1 creates any missing table from
+``Base.metadata``), so later steps check for what they add before adding it.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from typing import Callable, List, NamedTuple
+from .database import Base
+from .. import models  # noqa: F401  (registers every table on Base.metadata)
+from ..crud.stats import stats_crud
+from ..models.search import SEARCH_DDL, SEARCH_REBUILD
+
+migration_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+MIGRATIONS: List[Migration] = []
+
+def migration(version: int, description: str):
+    def register(apply: Callable[[Connection], None]):
+        MIGRATIONS.append(Migration(version, description, apply))
+        return apply
+    return register
+
+def create_missing_indexes(connection: Connection):
+    """Create every index declared on the models that the database lacks."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+
+def add_column_if_missing(connection: Connection, table_name: str, column_ddl: str):
+    column_name = column_ddl.split()[0]
+    existing = {column["name"] for column in inspect(connection).get_columns(table_name)}
+    if column_name not in existing:
+        connection.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN {column_ddl}")
+
+@migration(1, "Create base tables")
+def _create_base_tables(connection: Connection):
+    Base.metadata.create_all(bind=connection)
+
+@migration(2, "Add composite indexes for task, comment and membership lookups")
+def _add_access_pattern_indexes(connection: Connection):
+    create_missing_indexes(connection)
+
+@migration(3, "Backfill project_access from project owners and contributors")
+def _backfill_project_access(connection: Connection):
+    create_missing_indexes(connection)
+    connection.exec_driver_sql(
+        "INSERT OR IGNORE INTO project_access (user_id, project_id, role) "
+        "SELECT owner_id, id, 'OWNER' FROM projects"
+    )
+    connection.exec_driver_sql(
+        "INSERT OR IGNORE INTO project_access (user_id, project_id, role) "
+        "SELECT DISTINCT user_id, project_id, 'CONTRIBUTOR' FROM project_contributors "
+        "WHERE user_id IS NOT NULL AND project_id IS NOT NULL"
+    )
+
+@migration(4, "Add version and updated_at columns to projects and tasks")
+def _add_version_columns(connection: Connection):
+    for table_name in ("projects", "tasks"):
+        add_column_if_missing(connection, table_name, "version INTEGER DEFAULT 1 NOT NULL")
+        add_column_if_missing(connection, table_name, "updated_at DATETIME")
+
+@migration(5, "Create and backfill project statistics counters")
+def _create_project_stats(connection: Connection):
+    Base.metadata.create_all(bind=connection, tables=[models.ProjectStats.__table__, models.ProjectAssigneeStats.__table__])
+    stats_crud.rebuild(connection)
+
+@migration(6, "Create and backfill the full-text search index")
+def _create_search_index(connection: Connection):
+    for statement in SEARCH_DDL + SEARCH_REBUILD:
+        connection.exec_driver_sql(statement)
+
+@migration(7, "Create the project change log")
+def _create_change_log(connection: Connection):
+    Base.metadata.create_all(bind=connection, tables=[models.ProjectChange.__table__, models.ChangeLogWatermark.__table__])
+
+def current_version(connection: Connection) -> int:
+    migration_metadata.create_all(bind=connection)
+    versions = connection.execute(select(schema_version.c.version)).scalars().all()
+    return max(versions, default=0)
+
+def run_migrations(engine: Engine) -> List[Migration]:
+    """Apply pending migrations, each in its own transaction. Returns the ones applied."""
+    applied = []
+    with engine.begin() as connection:
+        version = current_version(connection)
+    for pending in sorted(MIGRATIONS, key=lambda m: m.version):
+        if pending.version <= version:
+            continue
+        with engine.begin() as connection:
+            pending.apply(connection)
+            connection.execute(schema_version.insert().values(
+                version=pending.version,
+                description=pending.description,
+                applied_at=datetime.utcnow(),
+            ))
+        applied.append(pending)
+    return applied
@@ -2,4 +2,7 @@ from .user import User
 from .project import Project
 from .task import Task
 from .comment import Comment
-from .access_rights import ProjectAccess, AccessRole
\ No newline at end of file
+from .access_rights import ProjectAccess, AccessRole
+from .stats import ProjectStats, ProjectAssigneeStats
+from .search import SEARCH_TABLE
+from .change import ProjectChange, ChangeLogWatermark, ChangeEntity, ChangeOp
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Enum, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Enum, CheckConstraint, Index
 from sqlalchemy.orm import relationship, validates
 from enum import Enum as PyEnum
 from ..db.database import Base
@@ -13,6 +13,9 @@ class ProjectAccess(Base):
     __table_args__ = (
         CheckConstraint('user_id > 0', name='access_user_id_positive'),
         CheckConstraint('project_id > 0', name='access_project_id_positive'),
+        # "projects of a user" and "role of a user in a project" are answered from this index alone
+        Index('ux_project_access_user_id_project_id_role', 'user_id', 'project_id', 'role', unique=True),
+        Index('ix_project_access_project_id_role_user_id', 'project_id', 'role', 'user_id'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -21,7 +24,7 @@ class ProjectAccess(Base):
     role = Column(Enum(AccessRole), nullable=False)
 
     user = relationship("User")
-    project = relationship("Project")
+    project = relationship("Project", back_populates="access_rights")
     
     @validates('user_id')
     def validate_user_id(self, key, user_id):
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Index
+from enum import Enum as PyEnum
+from datetime import datetime
+from ..db.database import Base
+
+class ChangeEntity(PyEnum):
+    PROJECT = "project"
+    TASK = "task"
+    COMMENT = "comment"
+    CONTRIBUTOR = "contributor"
+
+class ChangeOp(PyEnum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class ProjectChange(Base):
+    """Append-only log of project mutations, written in the same transaction as the mutation.
+
+    Ids only grow (AUTOINCREMENT never reuses the ids of compacted rows), so an
+    id is a sync cursor across every project.
+    """
+    __tablename__ = "project_changes"
+    __table_args__ = (
+        Index('ix_project_changes_project_id_id', 'project_id', 'id'),
+        {'sqlite_autoincrement': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    entity = Column(Enum(ChangeEntity), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(Enum(ChangeOp), nullable=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class ChangeLogWatermark(Base):
+    """Highest change id compacted away per project; older cursors must resync."""
+    __tablename__ = "change_log_watermarks"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    compacted_through = Column(Integer, default=0, nullable=False)
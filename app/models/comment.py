@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, CheckConstraint, Index
 from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from ..db.database import Base
@@ -9,6 +9,7 @@ class Comment(Base):
         CheckConstraint('length(text) >= 1 AND length(text) <= 1000', name='comment_text_length'),
         CheckConstraint('author_id > 0', name='comment_author_id_positive'),
         CheckConstraint('task_id > 0', name='comment_task_id_positive'),
+        Index('ix_comments_task_id_created_at', 'task_id', 'created_at', 'id'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
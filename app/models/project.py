@@ -1,14 +1,18 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, Enum, CheckConstraint
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, Enum, CheckConstraint, Index, select, func
+from sqlalchemy.orm import relationship, validates, column_property
 from datetime import datetime
 from enum import Enum as PyEnum
 from ..db.database import Base
+from .access_rights import ProjectAccess, AccessRole
 
+# Legacy membership table, superseded by project_access and kept for backfills
 project_contributors = Table(
     'project_contributors',
     Base.metadata,
     Column('project_id', Integer, ForeignKey('projects.id')),
-    Column('user_id', Integer, ForeignKey('users.id'))
+    Column('user_id', Integer, ForeignKey('users.id')),
+    Index('ix_project_contributors_user_id_project_id', 'user_id', 'project_id'),
+    Index('ix_project_contributors_project_id_user_id', 'project_id', 'user_id')
 )
 
 class Project(Base):
@@ -23,12 +27,29 @@ class Project(Base):
     title = Column(String(200), index=True, nullable=False)
     description = Column(String(2000))
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Bumped by every write to the project or its tasks, comments and members; drives ETags
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Counted from the (project_id, role, user_id) index without loading the members
+    contributor_count = column_property(
+        select(func.count(ProjectAccess.id))
+        .where(ProjectAccess.project_id == id, ProjectAccess.role == AccessRole.CONTRIBUTOR)
+        .correlate_except(ProjectAccess)
+        .scalar_subquery()
+    )
     
     owner = relationship("User", foreign_keys=[owner_id])
-    contributors = relationship("User", secondary=project_contributors, back_populates="contributed_projects")
+    contributors = relationship(
+        "User",
+        secondary="project_access",
+        primaryjoin="and_(Project.id == ProjectAccess.project_id, ProjectAccess.role == 'CONTRIBUTOR')",
+        secondaryjoin="User.id == ProjectAccess.user_id",
+        back_populates="contributed_projects",
+        viewonly=True
+    )
     tasks = relationship("Task", back_populates="project")
-    access_rights = relationship("ProjectAccess", back_populates="project")
+    access_rights = relationship("ProjectAccess", back_populates="project", cascade="all, delete-orphan")
     
     @validates('title')
     def validate_title(self, key, title):
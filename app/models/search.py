@@ -0,0 +1,62 @@
+from sqlalchemy import DDL, event
+from ..db.database import Base
+
+# Full-text index over task titles/descriptions and comment texts. FTS5 virtual
+# tables cannot be declared as models, so the table and the triggers keeping it
+# in step with tasks and comments are plain DDL run whenever the tables are
+# created. Rowids are derived from the source row (2 * id for tasks, 2 * id + 1
+# for comments) so triggers can find an entry without a lookup.
+SEARCH_TABLE = "search_index"
+
+SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, body,
+        kind UNINDEXED, ref_id UNINDEXED, task_id UNINDEXED, project_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO {SEARCH_TABLE} (rowid, title, body, kind, ref_id, task_id, project_id)
+        VALUES (new.id * 2, new.title, coalesce(new.description, ''), 'task', new.id, new.id, new.project_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_update AFTER UPDATE OF title, description, project_id ON tasks BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+        INSERT INTO {SEARCH_TABLE} (rowid, title, body, kind, ref_id, task_id, project_id)
+        VALUES (new.id * 2, new.title, coalesce(new.description, ''), 'task', new.id, new.id, new.project_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_delete AFTER DELETE ON tasks BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_search_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO {SEARCH_TABLE} (rowid, title, body, kind, ref_id, task_id, project_id)
+        SELECT new.id * 2 + 1, '', new.text, 'comment', new.id, new.task_id, tasks.project_id
+        FROM tasks WHERE tasks.id = new.task_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_search_update AFTER UPDATE OF text, task_id ON comments BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+        INSERT INTO {SEARCH_TABLE} (rowid, title, body, kind, ref_id, task_id, project_id)
+        SELECT new.id * 2 + 1, '', new.text, 'comment', new.id, new.task_id, tasks.project_id
+        FROM tasks WHERE tasks.id = new.task_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_search_delete AFTER DELETE ON comments BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+    END""",
+]
+
+# Re-index every task and comment, e.g. after the table is added to an existing database
+SEARCH_REBUILD = [
+    f"DELETE FROM {SEARCH_TABLE}",
+    f"""INSERT INTO {SEARCH_TABLE} (rowid, title, body, kind, ref_id, task_id, project_id)
+        SELECT id * 2, title, coalesce(description, ''), 'task', id, id, project_id FROM tasks""",
+    f"""INSERT INTO {SEARCH_TABLE} (rowid, title, body, kind, ref_id, task_id, project_id)
+        SELECT comments.id * 2 + 1, '', comments.text, 'comment', comments.id, comments.task_id, tasks.project_id
+        FROM comments JOIN tasks ON tasks.id = comments.task_id""",
+]
+
+def _tables_exist(ddl, target, bind, tables=None, **kw):
+    # create_all(tables=[...]) may run before tasks and comments exist
+    existing = set(bind.dialect.get_table_names(bind))
+    return {"tasks", "comments"} <= existing
+
+for statement in SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite", callable_=_tables_exist))
+event.listen(Base.metadata, "before_drop", DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}").execute_if(dialect="sqlite"))
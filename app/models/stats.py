@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from ..db.database import Base
+
+class ProjectStats(Base):
+    """Per-project task and comment counters, kept in step by the CRUD layer in each write's transaction."""
+    __tablename__ = "project_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    todo_count = Column(Integer, default=0, nullable=False)
+    in_progress_count = Column(Integer, default=0, nullable=False)
+    done_count = Column(Integer, default=0, nullable=False)
+    comment_count = Column(Integer, default=0, nullable=False)
+
+class ProjectAssigneeStats(Base):
+    __tablename__ = "project_assignee_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    task_count = Column(Integer, default=0, nullable=False)
+    done_count = Column(Integer, default=0, nullable=False)
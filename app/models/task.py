@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, CheckConstraint, Index
 from sqlalchemy.orm import relationship, validates
 from enum import Enum as PyEnum
 from datetime import datetime
@@ -16,6 +16,10 @@ class Task(Base):
         CheckConstraint('description IS NULL OR length(description) <= 1000', name='task_description_length'),
         CheckConstraint('project_id > 0', name='task_project_id_positive'),
         CheckConstraint('assigned_user_id IS NULL OR assigned_user_id > 0', name='task_assigned_user_id_positive'),
+        Index('ix_tasks_project_id_created_at', 'project_id', 'created_at', 'id'),
+        Index('ix_tasks_project_id_status_created_at', 'project_id', 'status', 'created_at'),
+        Index('ix_tasks_status_project_id', 'status', 'project_id'),
+        Index('ix_tasks_assigned_user_id_project_id', 'assigned_user_id', 'project_id'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -25,6 +29,8 @@ class Task(Base):
     assigned_user_id = Column(Integer, ForeignKey("users.id"))
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     project = relationship("Project", back_populates="tasks")
     assigned_user = relationship("User")
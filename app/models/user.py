@@ -16,7 +16,14 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
-    contributed_projects = relationship("Project", secondary="project_contributors", back_populates="contributors")
+    contributed_projects = relationship(
+        "Project",
+        secondary="project_access",
+        primaryjoin="and_(User.id == ProjectAccess.user_id, ProjectAccess.role == 'CONTRIBUTOR')",
+        secondaryjoin="Project.id == ProjectAccess.project_id",
+        back_populates="contributors",
+        viewonly=True
+    )
     
     @validates('username')
     def validate_username(self, key, username):
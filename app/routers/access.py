@@ -0,0 +1,57 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from ..crud.access import access_crud, ProjectGrant
+from ..crud.task import task_crud
+from ..models.access_rights import AccessRole
+from ..models.task import Task
+from ..models.user import User
+
+def check_project_access(project_id: int, user: User, db: Session) -> ProjectGrant:
+    """Grant of a project member; 404 if the project does not exist, 403 if the user is not a member."""
+    grant = access_crud.get_project_grant(db, user.id, project_id)
+    if not grant:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Project with ID {project_id} not found"
+        )
+
+    if not grant.is_member:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Access denied. You must be the project owner or a contributor to access project '{grant.project_title}'. Contact the project owner ({grant.owner_username}) to request access."
+        )
+
+    return grant
+
+def check_task_access(task_id: int, user: User, db: Session) -> Task:
+    """The task, if the user is a member of its project; a missing task and project are both a 404."""
+    task = task_crud.get_by_id(db, task_id)
+    grant = access_crud.get_project_grant(db, user.id, task.project_id) if task else None
+    if not grant:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Task with ID {task_id} not found"
+        )
+
+    if not grant.is_member:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Access denied. You must be the owner or a contributor of project '{grant.project_title}' to access task '{task.title}'. Contact the project owner ({grant.owner_username}) to request access."
+        )
+
+    return task
+
+def check_project_owner(project_id: int, user: User, db: Session, action: str) -> ProjectGrant:
+    """Grant of the project owner; ``action`` completes the 403 message, e.g. "update project"."""
+    grant = access_crud.get_project_grant(db, user.id, project_id)
+    if not grant:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Project with ID {project_id} not found"
+        )
+    if grant.role != AccessRole.OWNER:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Access denied. Only the project owner ({grant.owner_username}) can {action} '{grant.project_title}'."
+        )
+    return grant
@@ -1,13 +1,18 @@
+import time
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from ..db.database import get_db
 from ..models import User
 from ..schemas.user import UserCreate, UserResponse, UserLogin
 from ..schemas.token import Token
 from ..crud.user import user_crud
-from ..core.security import verify_password, create_access_token, verify_token
+from ..core.security import (
+    verify_password_async, get_password_hash_async, password_needs_rehash,
+    create_access_token, decode_token, principal_cache
+)
 from ..core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -15,14 +20,42 @@ user_router = APIRouter(tags=["users"])
 security = HTTPBearer()
 
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    email = verify_token(credentials.credentials)
-    if email is None:
+    token = credentials.credentials
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+
+    payload = decode_token(token)
+    email = payload.get("sub") if payload else None
+    expires_at = payload.get("exp") if payload else None
+    # Tokens are only issued with an expiry, and the cache entry must not outlive it
+    if email is None or expires_at is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
     user = user_crud.get_by_email(db, email)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
+
+    # Detach the user so it can be shared by later requests with the same token;
+    # it is never cached past the token's own expiry.
+    db.expunge(user)
+    principal_cache.set(token, user, ttl=expires_at - time.time(), tags=[user.id])
     return user
 
+def _store_password_hash(bind, user_id: int, hashed_password: str):
+    with Session(bind=bind) as db:
+        user_crud.update_password_hash(db, user_id, hashed_password)
+
+async def rehash_password(bind, user_id: int, password: str):
+    """Bring a stored hash in line with the calibrated hashing policy.
+
+    Runs as a background task after the response, when the request session is
+    already closed, so it writes through a session of its own on ``bind``.
+    """
+    hashed_password = await get_password_hash_async(password)
+    await run_in_threadpool(_store_password_hash, bind, user_id, hashed_password)
+
 @router.post("/signup",
     response_model=UserResponse,
     summary="Register a new user",
@@ -32,12 +65,13 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
         400: {"description": "Username already exists"}
     }
 )
-def signup(user_create: UserCreate, db: Session = Depends(get_db)):
-    if user_crud.get_by_username(db, user_create.username):
+async def signup(user_create: UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(user_crud.get_by_username, db, user_create.username):
         raise HTTPException(status_code=400, detail="Username already registered")
-    if user_crud.get_by_email(db, user_create.email):
+    if await run_in_threadpool(user_crud.get_by_email, db, user_create.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    return user_crud.create(db, user_create)
+    hashed_password = await get_password_hash_async(user_create.password)
+    return await run_in_threadpool(user_crud.create, db, user_create, hashed_password)
 
 @router.post("/login",
     response_model=Token,
@@ -48,13 +82,14 @@ def signup(user_create: UserCreate, db: Session = Depends(get_db)):
         401: {"description": "Invalid username or password"}
     }
 )
-def login(user_login: UserLogin, db: Session = Depends(get_db)):
-    user = user_crud.get_by_email(db, user_login.email)
+async def login(user_login: UserLogin, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(user_crud.get_by_email, db, user_login.email)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    if not verify_password(user_login.password, user.hashed_password):
+    if not await verify_password_async(user_login.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    
+    if password_needs_rehash(user.hashed_password):
+        background_tasks.add_task(rehash_password, db.get_bind(), user.id, user_login.password)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(data={"sub": user.email}, expires_delta=access_token_expires)
@@ -0,0 +1,17 @@
+from fastapi import Response
+from typing import Callable
+from ..core.response_cache import CachedResponse, response_cache, project_tag
+from .rendering import json_response
+
+def cached_json(response: Response, key: str, project_id: int, render: Callable[[], bytes]) -> Response:
+    """Serve a JSON body from the response cache, or render and store it.
+
+    Run the access checks before calling this. ``render`` returns the encoded
+    body and may set headers on ``response`` (e.g. the next cursor); those
+    headers are cached with the body.
+    """
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = CachedResponse(render(), tuple(response.headers.items()))
+        response_cache.set(key, entry, tags=[project_tag(project_id)])
+    return json_response(response, entry.body, entry.headers)
@@ -1,37 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from ..db.database import get_db
+from ..db.group_commit import run_write
 from ..schemas.comment import CommentCreate, CommentResponse
 from ..crud.comment import comment_crud
-from ..crud.task import task_crud
+from ..crud.access import access_crud
 from ..crud.project import project_crud
+from ..core.response_cache import response_key
 from ..models.user import User
+from .access import check_task_access
 from .auth import get_current_user
+from .pagination import PageParams, set_next_cursor
+from .caching import cached_json
+from .rendering import render_items, row_serializer, sparse_fields
 
 router = APIRouter(tags=["comments"])
 
-def check_task_access(task_id: int, user: User, db: Session):
-    task = task_crud.get_by_id(db, task_id)
-    if not task:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Task with ID {task_id} not found"
-        )
-    
-    project = project_crud.get_by_id(db, task.project_id)
-    if project.owner_id != user.id and user not in project.contributors:
-        raise HTTPException(
-            status_code=403, 
-            detail=f"Access denied. You must be the owner or a contributor of project '{project.title}' to access comments for task '{task.title}'. Contact the project owner ({project.owner.username}) to request access."
-        )
-    
-    return task
+comment_adapter = TypeAdapter(CommentResponse)
+comment_list_adapter = TypeAdapter(List[CommentResponse])
+comment_fields = sparse_fields(CommentResponse)
 
 @router.get("/tasks/{task_id}/comments", response_model=List[CommentResponse], dependencies=[Depends(get_current_user)])
-def get_task_comments(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    check_task_access(task_id, current_user, db)
-    return comment_crud.get_by_task(db, task_id)
+def get_task_comments(task_id: int, response: Response, page: PageParams = Depends(), fields: Optional[Tuple[str, ...]] = Depends(comment_fields), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    task = check_task_access(task_id, current_user, db)
+    # The grant comes from the access cache populated by the check above
+    grant = access_crud.get_project_grant(db, current_user.id, task.project_id)
+    version = project_crud.get_version(db, task.project_id)
+
+    def render():
+        rows = row_serializer(comment_crud.row_serializer, fields)
+        result = comment_crud.get_by_task(db, task_id, page.limit, page.after, rows=rows)
+        set_next_cursor(response, result.next_cursor)
+        return render_items(result.items, comment_list_adapter, rows)
+
+    key = response_key(f"task-{task_id}-comments", version, grant.role, page.limit, page.after, fields)
+    return cached_json(response, key, task.project_id, render)
 
 @router.post("/tasks/{task_id}/comments", response_model=CommentResponse, dependencies=[Depends(get_current_user)])
 def create_task_comment(task_id: int, comment_create: CommentCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -39,4 +44,5 @@ def create_task_comment(task_id: int, comment_create: CommentCreate, current_use
     # Create a new CommentCreate with the task_id set
     comment_data = comment_create.model_dump()
     comment_data['task_id'] = task_id
-    return comment_crud.create(db, CommentCreate(**comment_data), current_user.id)
\ No newline at end of file
+    author_id = current_user.id
+    return run_write(db, lambda session: comment_crud.create(session, CommentCreate(**comment_data), author_id), comment_adapter)
\ No newline at end of file
@@ -0,0 +1,26 @@
+import hashlib
+from fastapi import Request, Response
+from typing import Optional
+
+ETAG_HEADER = "ETag"
+
+def make_etag(resource: str, version: int, *variant) -> str:
+    """A strong ETag for one version of a resource; ``variant`` covers query parameters that change the body."""
+    tag = f"{resource}-v{version}"
+    if variant:
+        tag += "-" + hashlib.sha1(repr(variant).encode()).hexdigest()[:16]
+    return f'"{tag}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Tag the response; returns a 304 to send instead when the client already holds this version."""
+    response.headers[ETAG_HEADER] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers={ETAG_HEADER: etag, "Cache-Control": "no-cache"})
+    return None
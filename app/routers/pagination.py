@@ -0,0 +1,18 @@
+from fastapi import Query, Response
+from typing import Optional
+from ..core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="Maximum number of items to return"),
+        after: Optional[str] = Query(None, description=f"Opaque cursor taken from the {NEXT_CURSOR_HEADER} header of the previous page"),
+    ):
+        self.limit = limit
+        self.after = after
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
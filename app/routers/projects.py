@@ -1,70 +1,249 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
+from ..core.config import settings
+from ..core.events import ProjectEvent, event_broker
+from ..core.serialization import dumps
 from ..db.database import get_db
-from ..schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
+from ..db.group_commit import run_write
+from ..schemas.user import UserResponse
+from ..schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectDetailResponse, ContributorsUpdate, ContributorsUpdateResponse
+from ..schemas.task import TaskResponse
+from ..schemas.comment import CommentResponse
+from ..schemas.importer import ImportSummary
+from ..schemas.stats import ProjectStatsResponse
+from ..schemas.changes import ProjectChangesResponse
 from ..crud.project import project_crud
 from ..crud.user import user_crud
+from ..crud.export import export_crud
+from ..crud.task import task_crud
+from ..crud.comment import comment_crud
+from ..crud.stats import stats_crud
+from ..crud.changes import change_crud
+from ..crud.importer import import_crud, IMPORT_FORMATS
+from ..core.response_cache import response_key
+from ..models.change import ChangeEntity, ChangeOp
+from ..models.project import Project
 from ..models.user import User
+from .access import check_project_access, check_project_owner
 from .auth import get_current_user
+from .pagination import PageParams, set_next_cursor
+from .conditional import make_etag, not_modified
+from .caching import cached_json
+from .rendering import list_response, row_serializer, sparse_fields
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
-def check_project_access(project_id: int, user: User, db: Session):
+project_response_adapter = TypeAdapter(ProjectResponse)
+task_list_adapter = TypeAdapter(List[TaskResponse])
+comment_list_adapter = TypeAdapter(List[CommentResponse])
+project_fields = sparse_fields(ProjectResponse)
+
+def get_project_or_404(db: Session, project_id: int) -> Project:
+    # Write units reload the project on their own session; it may be gone by then
     project = project_crud.get_by_id(db, project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Project with ID {project_id} not found"
-        )
-    
-    if project.owner_id != user.id and user not in project.contributors:
-        raise HTTPException(
-            status_code=403, 
-            detail=f"Access denied. You must be the project owner or a contributor to access project '{project.title}'. Contact the project owner ({project.owner.username}) to request access."
-        )
-    
+    if project is None:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
     return project
 
+PROJECT_INCLUDES = ("tasks", "tasks.comments")
+
+class ProjectIncludes:
+    def __init__(
+        self,
+        include: Optional[str] = Query(None, description=f"Comma-separated related resources to embed: {', '.join(PROJECT_INCLUDES)}"),
+        tasks_limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX, description="Maximum number of tasks to embed"),
+        comments_limit: int = Query(settings.INCLUDE_COMMENTS_DEFAULT, ge=1, le=settings.INCLUDE_COMMENTS_MAX, description="Maximum number of most recent comments to embed per task"),
+    ):
+        requested = {name.strip() for name in (include or "").split(",") if name.strip()}
+        unknown = requested - set(PROJECT_INCLUDES)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown include(s) {', '.join(sorted(unknown))}. Available includes: {', '.join(PROJECT_INCLUDES)}"
+            )
+        self.comments = "tasks.comments" in requested
+        self.tasks = self.comments or "tasks" in requested
+        self.tasks_limit = tasks_limit
+        self.comments_limit = comments_limit
+
+    @property
+    def variant(self) -> Optional[tuple]:
+        """What the included content depends on, for ETags and cache keys."""
+        if not self.tasks:
+            return None
+        return (self.tasks_limit, self.comments_limit if self.comments else None)
+
 @router.post("/", response_model=ProjectResponse, dependencies=[Depends(get_current_user)])
 def create_project(project_create: ProjectCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return project_crud.create(db, project_create, current_user.id)
+    owner_id = current_user.id
+    return run_write(db, lambda session: project_crud.create(session, project_create, owner_id), project_response_adapter)
+
+@router.post("/import",
+    response_model=ImportSummary,
+    dependencies=[Depends(get_current_user)],
+    summary="Import projects, tasks and comments",
+    description="Upload an NDJSON or CSV file of `project`, `task` and `comment` records (the project export format). Rows are validated and written in chunks; imported projects are owned by the current user."
+)
+def import_projects(file: UploadFile, format: Optional[str] = Query(None, description="ndjson or csv; defaults to the file extension"), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    fmt = (format or (file.filename or "").rsplit(".", 1)[-1]).lower()
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported import format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return import_crud.import_records(db=db, stream=stream, fmt=fmt, owner_id=current_user.id)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+    finally:
+        stream.detach()
 
 @router.get("/", response_model=List[ProjectResponse], dependencies=[Depends(get_current_user)])
-def get_user_projects(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return project_crud.get_user_projects(db, current_user.id)
+def get_user_projects(response: Response, page: PageParams = Depends(), fields: Optional[Tuple[str, ...]] = Depends(project_fields), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    rows = row_serializer(project_crud.row_serializer, fields)
+    result = project_crud.get_user_projects(db, current_user.id, page.limit, page.after, rows=rows)
+    set_next_cursor(response, result.next_cursor)
+    return list_response(response, result.items, rows)
 
-@router.get("/{project_id}", response_model=ProjectResponse, dependencies=[Depends(get_current_user)])
-def get_project(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return check_project_access(project_id, current_user, db)
+@router.get("/{project_id}", response_model=ProjectDetailResponse, dependencies=[Depends(get_current_user)],
+    description="With `include=tasks` the project embeds its first tasks (and `tasks_next_cursor` to page through the rest with `GET /projects/{project_id}/tasks`); `include=tasks.comments` also embeds each task's most recent comments. The document is assembled with a fixed number of queries however many tasks it holds.",
+    responses={304: {"description": "The project has not changed since the version in If-None-Match"}}
+)
+def get_project(project_id: int, request: Request, response: Response, fields: Optional[Tuple[str, ...]] = Depends(project_fields), includes: ProjectIncludes = Depends(), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    grant = check_project_access(project_id, current_user, db)
+    version = project_crud.get_version(db, project_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+    cached = not_modified(request, response, make_etag(f"project-{project_id}", version, fields, includes.variant))
+    if cached:
+        return cached
 
-@router.put("/{project_id}", response_model=ProjectResponse, dependencies=[Depends(get_current_user)])
-def update_project(project_id: int, project_update: ProjectUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    def render():
+        project = project_response_adapter.validate_python(project_crud.get_by_id(db, project_id), from_attributes=True)
+        include = set(fields) if fields else None
+        if not includes.tasks:
+            return project_response_adapter.dump_json(project, include=include)
+
+        content = project_response_adapter.dump_python(project, mode="json", include=include)
+        page = task_crud.get_by_project(db, project_id, includes.tasks_limit)
+        tasks = task_list_adapter.dump_python(task_list_adapter.validate_python(page.items, from_attributes=True), mode="json")
+        if includes.comments:
+            recent = comment_crud.get_recent_by_tasks(db, [task.id for task in page.items], includes.comments_limit)
+            for task in tasks:
+                task["comments"] = comment_list_adapter.dump_python(
+                    comment_list_adapter.validate_python(recent[task["id"]], from_attributes=True), mode="json"
+                )
+        content["tasks"] = tasks
+        content["tasks_next_cursor"] = page.next_cursor
+        return dumps(content)
+
+    key = response_key(f"project-{project_id}", version, grant.role, fields, includes.variant)
+    return cached_json(response, key, project_id, render)
+
+@router.get("/{project_id}/stats",
+    response_model=ProjectStatsResponse,
+    dependencies=[Depends(get_current_user)],
+    summary="Get project statistics",
+    description="Task counts by status and by assignee, the comment total and the time of the last change, read from counters kept up to date on every write"
+)
+def get_project_stats(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_access(project_id, current_user, db)
     project = project_crud.get_by_id(db, project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Project with ID {project_id} not found"
-        )
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=403, 
-            detail=f"Access denied. Only the project owner ({project.owner.username}) can update project '{project.title}'. You are currently a contributor with read-only access."
+    return ProjectStatsResponse(**stats_crud.get(db, project_id), last_activity_at=project.updated_at or project.created_at)
+
+@router.get("/{project_id}/changes",
+    response_model=ProjectChangesResponse,
+    dependencies=[Depends(get_current_user)],
+    summary="Get project changes since a sync cursor",
+    description="Inserts, updates and deletes of the project, its tasks, comments and contributors after `since`, with the current state of what was inserted or updated. Each entity appears once, with its latest change. Pass the returned `cursor` as `since` next time, and keep going while `has_more` is true. Without `since`, or after the log was compacted past it, the answer is `resync_required`: reload the project, then continue from the returned cursor"
+)
+def get_project_changes(project_id: int, since: Optional[str] = Query(None, description="Cursor returned by the previous call"), limit: int = Query(settings.PAGE_SIZE_MAX, ge=1, le=settings.PAGE_SIZE_MAX, description="Maximum number of log entries to read"), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_access(project_id, current_user, db)
+    page = change_crud.get_since(db, project_id, since, limit)
+    changed = {entity: [] for entity in ChangeEntity}
+    for change in page.changes:
+        if change.op != ChangeOp.DELETE:
+            changed[change.entity].append(change.entity_id)
+    return ProjectChangesResponse(
+        changes=page.changes,
+        project=project_crud.get_by_id(db, project_id) if changed[ChangeEntity.PROJECT] else None,
+        tasks=task_crud.get_by_ids(db, changed[ChangeEntity.TASK]),
+        comments=comment_crud.get_by_ids(db, changed[ChangeEntity.COMMENT]),
+        cursor=page.cursor,
+        has_more=page.has_more,
+        resync_required=page.resync_required
+    )
+
+@router.get("/{project_id}/contributors", response_model=List[UserResponse], dependencies=[Depends(get_current_user)])
+def get_project_contributors(project_id: int, response: Response, page: PageParams = Depends(), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_access(project_id, current_user, db)
+    result = project_crud.get_contributors(db, project_id, page.limit, page.after)
+    set_next_cursor(response, result.next_cursor)
+    return result.items
+
+async def stream_project_events(project_id: int, user_id: int):
+    # Subscribe on the event loop that reads the queue, not in the endpoint's worker thread
+    def closes_stream(project_event: ProjectEvent) -> bool:
+        return project_event.type == "project.deleted" or (
+            project_event.type == "contributors.removed" and user_id in project_event.data["user_ids"]
         )
-    return project_crud.update(db, project, project_update)
+
+    subscription = event_broker.subscribe(project_id)
+    async for chunk in event_broker.stream(subscription, settings.EVENTS_HEARTBEAT_SECONDS, closes_stream):
+        yield chunk
+
+@router.get("/{project_id}/events",
+    dependencies=[Depends(get_current_user)],
+    summary="Stream live project changes",
+    description="Server-Sent Events announcing task, comment, contributor and project changes once they are committed. Each event names what changed (e.g. `task.updated` with its `task_id`) so clients refetch only that instead of polling. A comment line is sent every EVENTS_HEARTBEAT_SECONDS of silence; a client that falls too far behind gets a `dropped` event and should reconnect and refetch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}}
+)
+def stream_project_changes(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_access(project_id, current_user, db)
+    # The stream can stay open for hours; give the request's connection back now
+    db.close()
+    return StreamingResponse(
+        stream_project_events(project_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def stream_project_export(bind, project_id: int):
+    # The request session is closed once the endpoint returns, so the stream
+    # reads through its own session for as long as the client keeps reading.
+    with Session(bind=bind) as session:
+        yield from export_crud.iter_ndjson(export_crud.iter_project(session, project_id))
+
+@router.get("/{project_id}/export",
+    dependencies=[Depends(get_current_user)],
+    summary="Export a project as NDJSON",
+    description="Stream the project, its contributors, tasks and comments as newline-delimited JSON records, each tagged with a `type` field",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+def export_project(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_access(project_id, current_user, db)
+    return StreamingResponse(
+        stream_project_export(db.get_bind(), project_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.ndjson"'}
+    )
+
+@router.put("/{project_id}", response_model=ProjectResponse, dependencies=[Depends(get_current_user)])
+def update_project(project_id: int, project_update: ProjectUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_owner(project_id, current_user, db, "update project")
+    return run_write(db, lambda session: project_crud.update(session, get_project_or_404(session, project_id), project_update),
+                     project_response_adapter)
+
 @router.post("/{project_id}/contributors/{user_id}", dependencies=[Depends(get_current_user)])
 def add_contributor(project_id: int, user_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    project = project_crud.get_by_id(db, project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Project with ID {project_id} not found"
-        )
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=403, 
-            detail=f"Access denied. Only the project owner ({project.owner.username}) can add contributors to project '{project.title}'. You are currently a contributor with limited permissions."
-        )
+    grant = check_project_owner(project_id, current_user, db, "add contributors to project")
     
     user = user_crud.get_by_id(db, user_id)
     if not user:
@@ -73,18 +252,38 @@ def add_contributor(project_id: int, user_id: int, current_user: User = Depends(
             detail=f"User with ID {user_id} not found. Please verify the user ID and try again."
         )
     
-    project_crud.add_contributor(db, project, user)
-    return {"message": f"User '{user.username}' has been successfully added as a contributor to project '{project.title}'"}
+    run_write(db, lambda session: project_crud.add_contributors(session, project_id, [user_id]))
+    return {"message": f"User '{user.username}' has been successfully added as a contributor to project '{grant.project_title}'"}
+
+@router.patch("/{project_id}/contributors",
+    response_model=ContributorsUpdateResponse,
+    dependencies=[Depends(get_current_user)],
+    summary="Add and remove contributors in bulk",
+    description="Add the listed users as contributors and remove others; users already in the requested state are skipped"
+)
+def update_contributors(project_id: int, contributors_update: ContributorsUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_owner(project_id, current_user, db, "manage contributors of project")
+
+    missing_ids = set(contributors_update.add) - user_crud.get_existing_ids(db, contributors_update.add)
+    if missing_ids:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Users with IDs {sorted(missing_ids)} not found. Please verify the user IDs and try again."
+        )
+
+    def apply(session: Session):
+        removed = project_crud.remove_contributors(session, project_id, contributors_update.remove)
+        added = project_crud.add_contributors(session, project_id, contributors_update.add)
+        return ContributorsUpdateResponse(added=added, removed=removed)
+
+    return run_write(db, apply)
 
 @router.get("/users/{user_id}/projects", response_model=List[ProjectResponse])
-def get_projects_by_user_id(user_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_projects_by_user_id(user_id: int, response: Response, page: PageParams = Depends(), fields: Optional[Tuple[str, ...]] = Depends(project_fields), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get all projects for a specific user (only accessible projects for current user)"""
-    user_projects = project_crud.get_projects_by_user_id(db, user_id)
-    # Filter projects current user has access to
-    accessible_projects = []
-    for project in user_projects:
-        if project.owner_id == current_user.id or current_user in project.contributors:
-            accessible_projects.append(project)
-    return accessible_projects
+    rows = row_serializer(project_crud.row_serializer, fields)
+    result = project_crud.get_shared_projects(db, user_id, current_user.id, page.limit, page.after, rows=rows)
+    set_next_cursor(response, result.next_cursor)
+    return list_response(response, result.items, rows)
 
 
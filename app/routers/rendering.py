@@ -0,0 +1,56 @@
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type, Union
+from ..core.config import settings
+from ..core.serialization import RowSerializer, dumps
+
+def sparse_fields(schema: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """Dependency parsing a ``fields=`` query parameter into a subset of the schema's fields, in schema order."""
+    available = tuple(schema.model_fields)
+
+    def parse(fields: Optional[str] = Query(None, description=f"Comma-separated fields to return instead of the full object: {', '.join(available)}")):
+        if not fields:
+            return None
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(available)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown field(s) {', '.join(sorted(unknown))}. Available fields: {', '.join(available)}"
+            )
+        return tuple(field for field in available if field in requested)
+
+    return parse
+
+def row_serializer(serializer: RowSerializer, fields: Optional[Tuple[str, ...]]) -> Optional[RowSerializer]:
+    """The serializer to load a list with, or None to load ORM objects for the default path.
+
+    Lists are loaded as rows when a sparse fieldset is requested or FAST_SERIALIZATION is on.
+    """
+    if fields or settings.FAST_SERIALIZATION:
+        return serializer.subset(fields)
+    return None
+
+def json_response(response: Response, body: bytes, headers: Iterable[Tuple[str, str]] = ()) -> Response:
+    """Wrap an already encoded body, keeping the headers the endpoint set on ``response``."""
+    result = Response(content=body, media_type="application/json")
+    result.headers.update(dict(headers))
+    result.headers.update(response.headers)
+    return result
+
+def render_items(items: List[Any], adapter: TypeAdapter, rows: Optional[RowSerializer]) -> bytes:
+    """Encode a list loaded as ``rows``, or as ORM objects when ``rows`` is None."""
+    if rows is not None:
+        return dumps(rows.many(items))
+    return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+def list_response(response: Response, items: List[Any], rows: Optional[RowSerializer]) -> Union[Response, List[Any]]:
+    """Return a list loaded as ``rows`` (or as ORM objects when ``rows`` is None) from an endpoint.
+
+    Rows are serialized directly; ORM objects are returned for FastAPI to
+    validate against the endpoint's response_model. The declared response_model,
+    and so the OpenAPI schema, is the same either way.
+    """
+    if rows is not None:
+        return json_response(response, dumps(rows.many(items)))
+    return items
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..db.database import get_db
+from ..schemas.search import SearchResult
+from ..crud.search import InvalidSearchQuery, search_crud
+from ..models.user import User
+from .auth import get_current_user
+from .pagination import PageParams, set_next_cursor
+from .access import check_project_access
+
+router = APIRouter(tags=["search"])
+
+@router.get("/search", response_model=List[SearchResult])
+def search(response: Response, q: str = Query(..., min_length=1, max_length=200, description="Words to find in task titles, descriptions and comments; the last word also matches as a prefix"),
+           project_id: Optional[int] = Query(None, description="Only search this project"),
+           page: PageParams = Depends(), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Full-text search over the tasks and comments of the current user's accessible projects, best matches first"""
+    if project_id is not None:
+        check_project_access(project_id, current_user, db)
+    try:
+        result = search_crud.search(db, q, current_user.id, page.limit, page.after, project_id=project_id)
+    except InvalidSearchQuery as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid search query '{q}': {exc}")
+    set_next_cursor(response, result.next_cursor)
+    return [row._asdict() for row in result.items]
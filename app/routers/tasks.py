@@ -1,98 +1,149 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from ..db.database import get_db
-from ..schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from ..db.group_commit import run_write
+from ..schemas.task import (
+    TaskCreate, TaskResponse, TaskUpdate, TaskBatchCreate, TaskBatchError,
+    TaskBulkUpdate, TaskBulkUpdateResponse
+)
 from ..crud.task import task_crud
 from ..crud.project import project_crud
+from ..core.response_cache import response_key
+from ..crud.user import user_crud
 from ..models.user import User
-from ..models.task import TaskStatus
+from ..models.task import Task, TaskStatus
+from .access import check_project_access, check_task_access
 from .auth import get_current_user
+from .pagination import PageParams, set_next_cursor
+from .conditional import make_etag, not_modified
+from .caching import cached_json
+from .rendering import json_response, list_response, render_items, row_serializer, sparse_fields
 
 router = APIRouter(tags=["tasks"])
 
-def check_task_access(task_id: int, user: User, db: Session):
-    task = task_crud.get_by_id(db, task_id)
-    if not task:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Task with ID {task_id} not found"
-        )
-    
-    project = project_crud.get_by_id(db, task.project_id)
-    if project.owner_id != user.id and user not in project.contributors:
-        raise HTTPException(
-            status_code=403, 
-            detail=f"Access denied. You must be the owner or a contributor of project '{project.title}' to access task '{task.title}'. Contact the project owner ({project.owner.username}) to request access."
-        )
-    
+task_adapter = TypeAdapter(TaskResponse)
+task_list_adapter = TypeAdapter(List[TaskResponse])
+task_fields = sparse_fields(TaskResponse)
+
+def get_task_or_404(db: Session, task_id: int) -> Task:
+    # Write units reload the task on their own session; it may be gone by then
+    task = db.get(Task, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task with ID {task_id} not found")
     return task
 
-def check_project_access(project_id: int, user: User, db: Session):
-    project = project_crud.get_by_id(db, project_id)
-    if not project:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Project with ID {project_id} not found"
-        )
-    
-    if project.owner_id != user.id and user not in project.contributors:
-        raise HTTPException(
-            status_code=403, 
-            detail=f"Access denied. You must be the owner or a contributor of project '{project.title}' to perform this action. Contact the project owner ({project.owner.username}) to request access."
-        )
-    
-    return project
 
 
+@router.get("/projects/{project_id}/tasks", response_model=List[TaskResponse],
+    responses={304: {"description": "No task in the project has changed since the version in If-None-Match"}}
+)
+def get_project_tasks(project_id: int, request: Request, response: Response, page: PageParams = Depends(), fields: Optional[Tuple[str, ...]] = Depends(task_fields), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    grant = check_project_access(project_id, current_user, db)
+    version = project_crud.get_version(db, project_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+    cached = not_modified(request, response, make_etag(f"project-{project_id}-tasks", version, page.limit, page.after, fields))
+    if cached:
+        return cached
 
-@router.get("/projects/{project_id}/tasks", response_model=List[TaskResponse])
-def get_project_tasks(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    check_project_access(project_id, current_user, db)
-    return task_crud.get_by_project(db, project_id)
+    def render():
+        rows = row_serializer(task_crud.row_serializer, fields)
+        result = task_crud.get_by_project(db, project_id, page.limit, page.after, rows=rows)
+        set_next_cursor(response, result.next_cursor)
+        return render_items(result.items, task_list_adapter, rows)
+
+    key = response_key(f"project-{project_id}-tasks", version, grant.role, page.limit, page.after, fields)
+    return cached_json(response, key, project_id, render)
 
 @router.post("/projects/{project_id}/tasks", response_model=TaskResponse, dependencies=[Depends(get_current_user)])
 def create_project_task(project_id: int, task_create: TaskCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     check_project_access(project_id, current_user, db)
     task_create.project_id = project_id
-    return task_crud.create(db, task_create)
+    return run_write(db, lambda session: task_crud.create(session, task_create), task_adapter)
+
+@router.post("/projects/{project_id}/tasks/batch",
+    response_model=List[TaskResponse],
+    dependencies=[Depends(get_current_user)],
+    summary="Create many tasks at once",
+    description="Validate every task first and create all of them in one transaction, or none of them",
+    responses={422: {"description": "Per-item validation errors, as a list of {index, detail}"}}
+)
+def create_project_tasks(project_id: int, batch: TaskBatchCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_access(project_id, current_user, db)
+
+    rows, errors = [], []
+    for index, task_create in enumerate(batch.tasks):
+        task_create.project_id = project_id
+        try:
+            rows.append(task_crud.validate_create(task_create))
+        except ValueError as e:
+            errors.append(TaskBatchError(index=index, detail=str(e)))
+
+    assignee_ids = {row["assigned_user_id"] for row in rows if row["assigned_user_id"] is not None}
+    missing_ids = assignee_ids - user_crud.get_existing_ids(db, assignee_ids) if assignee_ids else set()
+    for index, task_create in enumerate(batch.tasks):
+        if task_create.assigned_user_id in missing_ids:
+            errors.append(TaskBatchError(index=index, detail=f"User with ID {task_create.assigned_user_id} not found"))
+
+    if errors:
+        raise HTTPException(
+            status_code=422,
+            detail=[error.model_dump() for error in sorted(errors, key=lambda error: error.index)]
+        )
+    return run_write(db, lambda session: task_crud.create_many(session, rows), task_list_adapter)
+
+@router.post("/projects/{project_id}/tasks/bulk-update",
+    response_model=TaskBulkUpdateResponse,
+    dependencies=[Depends(get_current_user)],
+    summary="Update many tasks at once",
+    description="Apply the same changes to the listed tasks, or to every task matching a filter, in one transaction"
+)
+def bulk_update_project_tasks(project_id: int, bulk_update: TaskBulkUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    check_project_access(project_id, current_user, db)
+    try:
+        values = task_crud.validate_update(bulk_update.changes)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    assigned_user_id = values.get("assigned_user_id")
+    if assigned_user_id is not None and not user_crud.get_existing_ids(db, [assigned_user_id]):
+        raise HTTPException(status_code=422, detail=f"User with ID {assigned_user_id} not found")
+
+    task_ids = run_write(db, lambda session: task_crud.update_many(session, project_id, values, bulk_update.task_ids, bulk_update.filter))
+    return TaskBulkUpdateResponse(updated=len(task_ids), task_ids=task_ids)
 
 @router.get("/tasks/{task_id}", response_model=TaskResponse, dependencies=[Depends(get_current_user)])
-def get_task(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return check_task_access(task_id, current_user, db)
+def get_task(task_id: int, response: Response, fields: Optional[Tuple[str, ...]] = Depends(task_fields), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    task = check_task_access(task_id, current_user, db)
+    if fields:
+        return json_response(response, task_adapter.dump_json(task_adapter.validate_python(task, from_attributes=True), include=set(fields)))
+    return task
 
 @router.put("/tasks/{task_id}", response_model=TaskResponse, dependencies=[Depends(get_current_user)])
 def update_task(task_id: int, task_update: TaskUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    task = check_task_access(task_id, current_user, db)
-    return task_crud.update(db, task, task_update)
+    check_task_access(task_id, current_user, db)
+    return run_write(db, lambda session: task_crud.update(session, get_task_or_404(session, task_id), task_update), task_adapter)
 
 @router.delete("/tasks/{task_id}", dependencies=[Depends(get_current_user)])
 def delete_task(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    task = check_task_access(task_id, current_user, db)
-    task_crud.delete(db, task)
+    check_task_access(task_id, current_user, db)
+    run_write(db, lambda session: task_crud.delete(session, get_task_or_404(session, task_id)))
     return {"message": "Task deleted successfully"}
 
 @router.get("/tasks/status/{status}", response_model=List[TaskResponse])
-def get_tasks_by_status(status: TaskStatus, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_tasks_by_status(status: TaskStatus, response: Response, page: PageParams = Depends(), fields: Optional[Tuple[str, ...]] = Depends(task_fields), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get all tasks by status for current user's accessible projects"""
-    all_tasks = task_crud.get_by_status(db, status)
-    # Filter tasks from projects user has access to
-    accessible_tasks = []
-    for task in all_tasks:
-        project = project_crud.get_by_id(db, task.project_id)
-        if project and (project.owner_id == current_user.id or current_user in project.contributors):
-            accessible_tasks.append(task)
-    return accessible_tasks
+    rows = row_serializer(task_crud.row_serializer, fields)
+    result = task_crud.get_visible_by_status(db, status, current_user.id, page.limit, page.after, rows=rows)
+    set_next_cursor(response, result.next_cursor)
+    return list_response(response, result.items, rows)
 
 @router.get("/users/{user_id}/tasks", response_model=List[TaskResponse])
-def get_tasks_by_user(user_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_tasks_by_user(user_id: int, response: Response, page: PageParams = Depends(), fields: Optional[Tuple[str, ...]] = Depends(task_fields), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get all tasks assigned to a specific user (only from accessible projects)"""
-    user_tasks = task_crud.get_by_user(db, user_id)
-    # Filter tasks from projects current user has access to
-    accessible_tasks = []
-    for task in user_tasks:
-        project = project_crud.get_by_id(db, task.project_id)
-        if project and (project.owner_id == current_user.id or current_user in project.contributors):
-            accessible_tasks.append(task)
-    return accessible_tasks
-
+    rows = row_serializer(task_crud.row_serializer, fields)
+    result = task_crud.get_visible_by_user(db, user_id, current_user.id, page.limit, page.after, rows=rows)
+    set_next_cursor(response, result.next_cursor)
+    return list_response(response, result.items, rows)
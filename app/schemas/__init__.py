@@ -1,6 +1,10 @@
 from .user import UserCreate, UserResponse, UserLogin
-from .project import ProjectCreate, ProjectResponse, ProjectUpdate
-from .task import TaskCreate, TaskResponse, TaskUpdate
+from .project import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectDetailResponse, TaskDetailResponse, ContributorsUpdate, ContributorsUpdateResponse
+from .task import TaskCreate, TaskResponse, TaskUpdate, TaskBatchCreate, TaskBatchError, TaskBulkUpdate, TaskBulkUpdateResponse
 from .comment import CommentCreate, CommentResponse
 from .access_rights import AccessRightsCreate, AccessRightsResponse
-from .token import Token
\ No newline at end of file
+from .token import Token
+from .importer import ImportRowError, ImportSummary
+from .stats import AssigneeStats, ProjectStatsResponse
+from .search import SearchResult
+from .changes import ChangeEntry, ProjectChangesResponse
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from ..models.change import ChangeEntity, ChangeOp
+from .comment import CommentResponse
+from .project import ProjectResponse
+from .task import TaskResponse
+
+class ChangeEntry(BaseModel):
+    id: int
+    entity: ChangeEntity
+    entity_id: int
+    op: ChangeOp
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ProjectChangesResponse(BaseModel):
+    changes: List[ChangeEntry]
+    # Current state of the project, tasks and comments inserted or updated in ``changes``
+    project: Optional[ProjectResponse] = None
+    tasks: List[TaskResponse] = []
+    comments: List[CommentResponse] = []
+    cursor: str
+    has_more: bool = False
+    resync_required: bool = False
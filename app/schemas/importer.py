@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    line: int
+    detail: str
+
+class ImportSummary(BaseModel):
+    projects: int = 0
+    tasks: int = 0
+    comments: int = 0
+    skipped: int = 0
+    error_count: int = 0
+    errors: List[ImportRowError] = []
@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
+from ..core.config import settings
 from .user import UserResponse
+from .task import TaskResponse
+from .comment import CommentResponse
 
 class ProjectBase(BaseModel):
     title: str
@@ -19,7 +22,24 @@ class ProjectResponse(ProjectBase):
     owner_id: int
     created_at: datetime
     owner: UserResponse
-    contributors: List[UserResponse] = []
+    contributor_count: int = 0
+    version: int = 1
+    updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TaskDetailResponse(TaskResponse):
+    comments: Optional[List[CommentResponse]] = None
+
+class ProjectDetailResponse(ProjectResponse):
+    tasks: Optional[List[TaskDetailResponse]] = None
+    tasks_next_cursor: Optional[str] = None
+
+class ContributorsUpdate(BaseModel):
+    add: List[int] = Field(default_factory=list, max_length=settings.CONTRIBUTOR_BATCH_MAX_SIZE)
+    remove: List[int] = Field(default_factory=list, max_length=settings.CONTRIBUTOR_BATCH_MAX_SIZE)
+
+class ContributorsUpdateResponse(BaseModel):
+    added: List[int]
+    removed: List[int]
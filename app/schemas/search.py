@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Literal
+
+class SearchResult(BaseModel):
+    kind: Literal["task", "comment"]
+    id: int
+    task_id: int
+    project_id: int
+    task_title: str
+    snippet: str
+    score: float
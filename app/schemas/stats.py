@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class AssigneeStats(BaseModel):
+    user_id: int
+    task_count: int
+    done_count: int
+
+class ProjectStatsResponse(BaseModel):
+    project_id: int
+    task_count: int
+    tasks_by_status: Dict[str, int]
+    assignees: List[AssigneeStats]
+    comment_count: int
+    last_activity_at: Optional[datetime] = None
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
+from ..core.config import settings
 from ..models.task import TaskStatus
 from .user import UserResponse
 
@@ -12,12 +13,49 @@ class TaskCreate(TaskBase):
     project_id: int
     assigned_user_id: Optional[int] = None
 
+class TaskBatchCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=settings.TASK_BATCH_MAX_SIZE)
+
+class TaskBatchError(BaseModel):
+    index: int
+    detail: str
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[TaskStatus] = None
     assigned_user_id: Optional[int] = None
 
+    @model_validator(mode='after')
+    def validate_status(self):
+        # Omit status to leave it unchanged; a task always has one
+        if 'status' in self.model_fields_set and self.status is None:
+            raise ValueError('status cannot be null')
+        return self
+
+class TaskFilter(BaseModel):
+    status: Optional[TaskStatus] = None
+    assigned_user_id: Optional[int] = None
+
+class TaskBulkUpdate(BaseModel):
+    task_ids: Optional[List[int]] = Field(None, min_length=1, max_length=settings.TASK_BATCH_MAX_SIZE)
+    filter: Optional[TaskFilter] = None
+    changes: TaskUpdate
+
+    @model_validator(mode='after')
+    def validate_selection(self):
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError('Provide exactly one of task_ids or filter')
+        if self.filter is not None and not self.filter.model_fields_set:
+            raise ValueError('filter must set at least one field')
+        if not self.changes.model_fields_set:
+            raise ValueError('changes must set at least one field')
+        return self
+
+class TaskBulkUpdateResponse(BaseModel):
+    updated: int
+    task_ids: List[int]
+
 class TaskResponse(TaskBase):
     id: int
     status: TaskStatus
@@ -25,6 +63,8 @@ class TaskResponse(TaskBase):
     assigned_user_id: Optional[int] = None
     assigned_user: Optional[UserResponse] = None
     created_at: datetime
+    version: int = 1
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
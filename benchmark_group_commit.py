@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Group commit benchmark
+Creates tasks from concurrent threads against a file database, each write
+committing on its own session (the default) or through the GROUP_COMMIT
+writer, and reports writes per second at each concurrency level
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from app.crud.task import task_crud
+from app.db.database import Base
+from app.db.group_commit import GroupCommitWriter
+from app.models import Project, User
+from app.schemas.task import TaskCreate
+
+def seed(engine) -> int:
+    with Session(engine) as session:
+        session.execute(insert(User), [{"username": "owner", "email": "owner@example.com", "hashed_password": "x"}])
+        project_id = session.execute(insert(Project).returning(Project.id), [{"title": "Benchmark", "owner_id": 1}]).scalar()
+        session.commit()
+    return project_id
+
+def run(engine, project_id: int, threads: int, writes: int, writer: GroupCommitWriter = None) -> float:
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    start = threading.Barrier(threads + 1)
+    failures = []
+
+    def worker():
+        start.wait()
+        for i in range(writes):
+            create = lambda session: task_crud.create(session, TaskCreate(title=f"Task {i}", project_id=project_id)).id
+            try:
+                if writer is not None:
+                    writer.submit(create)
+                else:
+                    with SessionLocal() as session:
+                        create(session)
+            except Exception as e:  # e.g. "database is locked" past the busy timeout
+                failures.append(e)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    started = time.perf_counter()
+    start.wait()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return (threads * writes - len(failures)) / elapsed, len(failures)
+
+def main(concurrency, writes: int, window_ms: float):
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in concurrency:
+            results = {}
+            for mode in ("default", "group"):
+                path = os.path.join(directory, f"{mode}-{threads}.db")
+                engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False},
+                                       pool_size=threads + 1, max_overflow=0)
+                Base.metadata.create_all(bind=engine)
+                project_id = seed(engine)
+                writer = GroupCommitWriter(engine, window_ms=window_ms) if mode == "group" else None
+                results[mode] = run(engine, project_id, threads, writes, writer)
+                if writer is not None:
+                    writer.close()
+                    results[mode] += (writer.stats()["units"] / max(writer.stats()["batches"], 1),)
+                engine.dispose()
+            default_rate, default_failures = results["default"]
+            group_rate, group_failures, per_batch = results["group"]
+            print(f"{threads:3} threads: default {default_rate:8.0f} writes/s ({default_failures} failed), "
+                  f"group {group_rate:8.0f} writes/s ({group_failures} failed, {per_batch:.1f} per commit)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 32], help="Concurrency levels to measure")
+    parser.add_argument("--writes", type=int, default=100, help="Writes per thread")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    main(args.threads, args.writes, args.window_ms)
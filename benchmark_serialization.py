@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark
+Compares the default response path (ORM objects validated by Pydantic, then the
+JSONResponse encoder) with the FAST_SERIALIZATION path (flat rows, precompiled
+row serializer, orjson when installed) on a large task list
+"""
+
+import argparse
+import json
+import time
+from typing import List
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.core.serialization import dumps, orjson
+from app.crud.task import task_crud
+from app.db.database import Base
+from app.models import Project, Task, User
+from app.schemas.task import TaskResponse
+
+def seed(session: Session, count: int) -> int:
+    session.execute(insert(User), [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": "x"} for i in range(1, 51)
+    ])
+    project_id = session.execute(insert(Project).returning(Project.id), [{"title": "Benchmark", "owner_id": 1}]).scalar()
+    session.execute(insert(Task), [
+        {"title": f"Task {i}", "description": "Benchmark task " * 5, "project_id": project_id,
+         "assigned_user_id": (i % 50) + 1 if i % 3 else None}
+        for i in range(count)
+    ])
+    session.commit()
+    return project_id
+
+def default_path(session: Session, project_id: int, count: int, adapter: TypeAdapter) -> bytes:
+    tasks = task_crud.get_by_project(session, project_id, count).items
+    content = adapter.dump_python(adapter.validate_python(tasks, from_attributes=True), mode="json")
+    return JSONResponse(content).body
+
+def fast_path(session: Session, project_id: int, count: int, adapter: TypeAdapter) -> bytes:
+    rows = task_crud.get_by_project(session, project_id, count, rows=task_crud.row_serializer).items
+    return dumps(task_crud.row_serializer.many(rows))
+
+def best_of(repeat: int, run, *args) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main(count: int, repeat: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    adapter = TypeAdapter(List[TaskResponse])
+    with Session(engine) as session:
+        project_id = seed(session, count)
+        results = {}
+        for name, run in (("default", default_path), ("fast", fast_path)):
+            session.expunge_all()
+            results[name] = best_of(repeat, run, session, project_id, count, adapter)
+        assert json.loads(default_path(session, project_id, count, adapter)) == json.loads(fast_path(session, project_id, count, adapter))
+
+    print(f"{count} tasks, best of {repeat} (JSON encoder: {'orjson' if orjson else 'json'})")
+    for name, seconds in results.items():
+        print(f"- {name:8} {seconds * 1000:8.1f} ms")
+    print(f"Speedup: {results['default'] / results['fast']:.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000, help="Number of tasks in the list")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.count, args.repeat)
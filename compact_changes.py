@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Change log compaction script
+Removes change log entries superseded by a later change of the same entity,
+and entries older than the retention period; clients whose sync cursor
+predates the removed entries are told to resync
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.db.migrations import run_migrations
+from app.crud.changes import change_crud
+
+def compact_changes(retention_days: int = settings.CHANGE_LOG_RETENTION_DAYS):
+    """Compact the change log of every project"""
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        superseded, expired = change_crud.compact(db, datetime.utcnow() - timedelta(days=retention_days))
+        db.commit()
+    finally:
+        db.close()
+    print(f"Removed {superseded} superseded and {expired} expired change log entries")
+    return superseded, expired
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--retention-days", type=int, default=settings.CHANGE_LOG_RETENTION_DAYS,
+                        help="Keep entries newer than this many days")
+    args = parser.parse_args()
+    compact_changes(args.retention_days)
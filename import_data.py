@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Bulk import script
+Streams projects, tasks and comments from an NDJSON or CSV file into the database
+"""
+
+import argparse
+import sys
+from app.db.database import SessionLocal, engine
+from app.db.migrations import run_migrations
+from app.crud.importer import import_crud, IMPORT_FORMATS
+from app.crud.user import user_crud
+
+def import_data(path: str, owner_email: str, fmt: str = None, chunk_size: int = None):
+    """Import a file, assigning every imported project to the user with the given email"""
+    fmt = (fmt or path.rsplit(".", 1)[-1]).lower()
+    if fmt not in IMPORT_FORMATS:
+        sys.exit(f"Unsupported import format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}")
+
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        owner = user_crud.get_by_email(db, owner_email)
+        if owner is None:
+            sys.exit(f"No user with email {owner_email}")
+        with open(path, encoding="utf-8", newline="") as stream:
+            summary = import_crud.import_records(db=db, stream=stream, fmt=fmt, owner_id=owner.id, chunk_size=chunk_size)
+    finally:
+        db.close()
+
+    print(f"Imported {summary.projects} projects, {summary.tasks} tasks, {summary.comments} comments")
+    if summary.skipped:
+        print(f"Skipped {summary.skipped} records")
+    if summary.error_count:
+        print(f"Rejected {summary.error_count} records:")
+        for error in summary.errors:
+            print(f"- line {error.line}: {error.detail}")
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="NDJSON or CSV file, e.g. a project export")
+    parser.add_argument("--owner-email", required=True, help="Email of the user who will own the imported projects")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, help="Rows per commit (defaults to IMPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+    import_data(args.path, args.owner_email, args.format, args.chunk_size)
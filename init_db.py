@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 """
 Database initialization script
-Creates tables and optionally adds sample data
+Creates tables and applies any pending schema migrations
 """
 
-from app.db.database import engine, Base
-from app.models import User, Project, Task, Comment
+from app.db.database import engine
+from app.db.migrations import run_migrations
 
 def init_database():
-    """Create all database tables"""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    """Create all database tables and indexes"""
+    print("Applying database migrations...")
+    applied = run_migrations(engine)
+    for migration in applied:
+        print(f"- {migration.version:04d} {migration.description}")
+    if not applied:
+        print("Database schema is already up to date.")
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    init_database()
@@ -1,15 +1,35 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import anyio
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import engine, Base
-from app.routers import auth, projects, tasks, comments
+from app.db.database import engine
+from app.db.migrations import run_migrations
+from app.db.group_commit import shutdown_writers
+from app.routers import auth, projects, tasks, comments, search
+from app.core.security import calibrate_password_hashing, shutdown_password_hashing, principal_cache
+from app.core.response_cache import response_cache
+from app.crud.access import access_crud
+from app.routers.auth import get_current_user
+from app.crud.pagination import InvalidCursor
+from app.routers.pagination import NEXT_CURSOR_HEADER
+from app.routers.conditional import ETAG_HEADER
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create or upgrade tables
+run_migrations(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await anyio.to_thread.run_sync(calibrate_password_hashing)
+    yield
+    shutdown_password_hashing()
+    shutdown_writers()
 
 app = FastAPI(
     title="Project Management API",
     description="A collaborative project management platform built with FastAPI.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 origins = [
@@ -23,15 +43,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
 # Routers
 app.include_router(auth.router)
 app.include_router(auth.user_router)
 app.include_router(projects.router)
 app.include_router(tasks.router)
 app.include_router(comments.router)
+app.include_router(search.router)
 
 @app.get("/")
 async def root():
     return {"message": "Project Management API", "docs": "/docs"}
+
+@app.get("/cache/stats", dependencies=[Depends(get_current_user)])
+def cache_stats():
+    """Hit and miss counters of the per-process caches"""
+    return {
+        "responses": response_cache.stats(),
+        "access": access_crud.cache_stats(),
+        "principals": principal_cache.stats(),
+    }
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Statistics rebuild script
+Recomputes the project statistics counters from the tasks and comments tables,
+reconciling any drift (e.g. after rows were changed outside the API)
+"""
+
+import argparse
+from app.db.database import SessionLocal, engine
+from app.db.migrations import run_migrations
+from app.crud.stats import stats_crud
+
+def rebuild_stats(project_id: int = None):
+    """Rebuild the counters of one project, or of every project"""
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        rebuilt = stats_crud.rebuild(db, project_id)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt statistics for {rebuilt} project(s)")
+    return rebuilt
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--project-id", type=int, help="Only rebuild this project")
+    args = parser.parse_args()
+    rebuild_stats(args.project_id)
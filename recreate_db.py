@@ -6,6 +6,7 @@ Drops existing tables and recreates them with updated schema and constraints
 
 import os
 from app.db.database import engine, Base
+from app.db.migrations import migration_metadata, run_migrations
 from app.models import User, Project, Task, Comment, ProjectAccess
 
 def recreate_database():
@@ -13,10 +14,11 @@ def recreate_database():
     
     # Drop all existing tables first
     Base.metadata.drop_all(bind=engine)
+    migration_metadata.drop_all(bind=engine)
     print("Dropped all existing tables")
     
     # Create all tables with updated schema and constraints
-    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     print("Created all tables with updated schema and validation constraints")
     
     print("\nTables created with validation:")
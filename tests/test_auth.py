@@ -35,4 +35,71 @@ def test_login_invalid_credentials(client: TestClient):
         "email": "nonexistent@example.com",
         "password": "wrongpass"
     })
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+def test_deactivated_user_token_rejected(client: TestClient):
+    from app.crud.user import user_crud
+    from tests.conftest import TestingSessionLocal
+
+    client.post("/auth/signup", json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "testpass123"
+    })
+    response = client.post("/auth/login", json={
+        "email": "test@example.com",
+        "password": "testpass123"
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/users/1", headers=headers).status_code == 200
+
+    db = TestingSessionLocal()
+    try:
+        user_crud.deactivate(db, user_crud.get_by_id(db, 1))
+    finally:
+        db.close()
+
+    # The cached principal is dropped, so the next request sees the deactivation
+    response = client.get("/users/1", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_login_rehashes_outdated_password_hash(client: TestClient):
+    from passlib.hash import pbkdf2_sha256
+    from app.core import security
+    from app.crud.user import user_crud
+    from tests.conftest import TestingSessionLocal
+
+    client.post("/auth/signup", json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "testpass123"
+    })
+    db = TestingSessionLocal()
+    try:
+        user_crud.update_password_hash(db, 1, pbkdf2_sha256.using(rounds=1000).hash("testpass123"))
+    finally:
+        db.close()
+
+    response = client.post("/auth/login", json={
+        "email": "test@example.com",
+        "password": "testpass123"
+    })
+    assert response.status_code == 200
+
+    db = TestingSessionLocal()
+    try:
+        hashed_password = user_crud.get_by_id(db, 1).hashed_password
+    finally:
+        db.close()
+    assert pbkdf2_sha256.from_string(hashed_password).rounds == security.password_hash_policy.rounds
+    assert not security.password_needs_rehash(hashed_password)
+
+def test_token_without_expiry_rejected(client: TestClient):
+    from jose import jwt
+    from app.core.config import settings
+    client.post("/auth/signup", json={"username": "testuser", "email": "test@example.com", "password": "testpass123"})
+    token = jwt.encode({"sub": "test@example.com"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    response = client.get("/users/1", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
@@ -0,0 +1,47 @@
+import time
+from app.core.cache import TTLCache
+from app.core.response_cache import CachedResponse, MemoryResponseBackend, ResponseCache
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+def test_ttl_cache_invalidates_by_tag():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set((1, 1), "owner", tags=[1])
+    cache.set((1, 2), "contributor", tags=[1])
+    cache.set((2, 1), "owner", tags=[2])
+    cache.invalidate_tag(1)
+    assert cache.get((1, 1)) is None
+    assert cache.get((1, 2)) is None
+    assert cache.get((2, 1)) == "owner"
+
+def test_response_cache_is_bounded_by_bytes():
+    cache = ResponseCache(MemoryResponseBackend(max_bytes=100, max_entry_bytes=60))
+    cache.set("a", CachedResponse(b"x" * 40), tags=["project:1"])
+    cache.set("b", CachedResponse(b"y" * 40), tags=["project:2"])
+    cache.get("a")
+    cache.set("c", CachedResponse(b"z" * 40))
+    cache.set("too-big", CachedResponse(b"w" * 61))
+    assert cache.get("a").body == b"x" * 40
+    assert cache.get("b") is None
+    assert cache.get("too-big") is None
+    assert cache.stats()["bytes"] == 80
+
+    cache.invalidate_project(1)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
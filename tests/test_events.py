@@ -0,0 +1,70 @@
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from app.core.events import EventBroker, event_broker, publish_on_commit
+from app.crud.project import project_crud
+from app.routers.projects import stream_project_events
+from tests.conftest import TestingSessionLocal
+from tests.test_tasks import setup_project_and_auth
+
+def parse(chunk: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines())
+    return {"event": fields.get("event"), "data": json.loads(fields["data"]) if "data" in fields else None}
+
+def test_broker_heartbeat_and_slow_consumer_drop():
+    async def listen():
+        broker = EventBroker(max_queued=2)
+        subscription = broker.subscribe(1)
+        stream = broker.stream(subscription, heartbeat=0.01)
+        assert (await stream.__anext__()).startswith(b"retry: ")
+        assert await stream.__anext__() == b": keep-alive\n\n"
+
+        # Published from a worker thread, like the sync endpoints do
+        await asyncio.to_thread(broker.publish, 1, "task.created", {"task_id": 7})
+        await asyncio.to_thread(broker.publish, 2, "task.created", {"task_id": 8})
+        assert parse(await stream.__anext__()) == {"event": "task.created", "data": {"task_id": 7}}
+
+        # Falling behind by more than the queue bound drops the listener
+        for task_id in range(3):
+            broker.publish(1, "task.updated", {"task_id": task_id})
+        await asyncio.sleep(0)
+        assert parse(await stream.__anext__())["event"] == "dropped"
+        assert [chunk async for chunk in stream] == []
+        return broker.stats()
+
+    assert asyncio.run(listen()) == {"subscribers": 0, "published": 5, "dropped": 1}
+
+def test_project_events_follow_commits(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+    client.post("/auth/signup", json={"username": "otheruser", "email": "other@example.com", "password": "testpass123"})
+    client.post(f"/projects/{project_id}/contributors/2", headers=headers)
+
+    async def listen():
+        stream = stream_project_events(project_id, user_id=2)
+        await stream.__anext__()
+        task = (await asyncio.to_thread(client.post, f"/projects/{project_id}/tasks",
+                                        json={"title": "Live", "project_id": project_id}, headers=headers)).json()
+        # Events of a rolled back transaction are never published
+        db = TestingSessionLocal()
+        project_crud.touch(db, project_id)
+        publish_on_commit(db, project_id, "task.updated", task_id=task["id"])
+        db.rollback()
+        db.commit()
+        db.close()
+        await asyncio.to_thread(client.post, f"/tasks/{task['id']}/comments", json={"text": "Hi"}, headers=headers)
+        # Removing the listener from the project ends their stream
+        await asyncio.to_thread(client.patch, f"/projects/{project_id}/contributors", json={"remove": [2]}, headers=headers)
+        return task, [parse(chunk) async for chunk in stream]
+
+    task, events = asyncio.run(listen())
+    assert [(event["event"], event["data"].get("task_id")) for event in events] == [
+        ("task.created", task["id"]), ("comment.created", task["id"]), ("contributors.removed", None)
+    ]
+    assert event_broker.stats()["subscribers"] == 0
+
+def test_project_events_require_membership(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+    client.post("/auth/signup", json={"username": "otheruser", "email": "other@example.com", "password": "testpass123"})
+    token = client.post("/auth/login", json={"email": "other@example.com", "password": "testpass123"}).json()["access_token"]
+    response = client.get(f"/projects/{project_id}/events", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
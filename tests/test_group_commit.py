@@ -0,0 +1,139 @@
+import pytest
+import threading
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud.stats import stats_crud
+from app.crud.task import task_crud
+from app.db.database import Base
+from app.db.group_commit import GroupCommitWriter, shutdown_writers
+from app.models import Project, Task, User
+from app.schemas.task import TaskCreate
+from tests.test_tasks import setup_project_and_auth
+
+def test_group_commit_batches_concurrent_writes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'group.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.execute(insert(User), [{"username": "owner", "email": "owner@example.com", "hashed_password": "x"}])
+        project_id = session.execute(insert(Project).returning(Project.id), [{"title": "Grouped", "owner_id": 1}]).scalar()
+        session.commit()
+
+    def create_then_fail(session):
+        task_crud.create(session, TaskCreate(title="Rolled back", project_id=project_id))
+        raise RuntimeError("unit failed after writing")
+
+    writer = GroupCommitWriter(engine, window_ms=50)
+    start = threading.Barrier(16)
+    results, errors = {}, {}
+
+    def submit(index):
+        start.wait()
+        try:
+            work = create_then_fail if index == 0 else (
+                lambda session: task_crud.create(session, TaskCreate(title=f"Task {index}", project_id=project_id)).id
+            )
+            results[index] = writer.submit(work)
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=submit, args=(index,)) for index in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    # One shared commit for most callers; the failed unit was rolled back to its savepoint alone
+    assert writer.stats()["batches"] < 16 and writer.stats()["units"] == 16
+    assert list(errors) == [0] and isinstance(errors[0], RuntimeError)
+    with Session(engine) as session:
+        titles = session.execute(select(Task.title).order_by(Task.id)).scalars().all()
+        assert sorted(titles) == sorted(f"Task {index}" for index in range(1, 16))
+        assert sorted(results.values()) == session.execute(select(Task.id).order_by(Task.id)).scalars().all()
+        assert stats_crud.get(session, project_id)["task_count"] == 15
+        assert session.execute(select(Project.version)).scalar() == 16
+    engine.dispose()
+
+def test_write_endpoints_with_group_commit(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "GROUP_COMMIT", True)
+    try:
+        headers, project_id = setup_project_and_auth(client)
+        task = client.post(f"/projects/{project_id}/tasks", json={"title": "Grouped", "project_id": project_id}, headers=headers)
+        assert task.status_code == 200 and task.json()["version"] == 1
+        task_id = task.json()["id"]
+        etag = client.get(f"/projects/{project_id}/tasks", headers=headers).headers["ETag"]
+
+        updated = client.put(f"/tasks/{task_id}", json={"status": "done"}, headers=headers).json()
+        assert (updated["status"], updated["version"]) == ("done", 2)
+        comment = client.post(f"/tasks/{task_id}/comments", json={"text": "Shared commit"}, headers=headers).json()
+        assert comment["author"]["username"] == "testuser"
+        # Cached reads are dropped once the shared transaction commits
+        refreshed = client.get(f"/projects/{project_id}/tasks", headers={**headers, "If-None-Match": etag})
+        assert refreshed.status_code == 200 and refreshed.json()[0]["status"] == "done"
+
+        batch = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [{"title": "A", "project_id": project_id}]}, headers=headers)
+        assert [task["title"] for task in batch.json()] == ["A"]
+        assert client.delete(f"/tasks/{task_id}", headers=headers).status_code == 200
+        assert [task["title"] for task in client.get(f"/projects/{project_id}/tasks", headers=headers).json()] == ["A"]
+        assert client.get(f"/projects/{project_id}/stats", headers=headers).json()["task_count"] == 1
+    finally:
+        shutdown_writers()
+
+def test_project_writes_with_group_commit(client: TestClient, monkeypatch):
+    from fastapi import HTTPException
+    from app.db.group_commit import run_write
+    from app.routers.tasks import get_task_or_404
+    from tests.conftest import TestingSessionLocal
+    from tests.test_projects import get_auth_headers
+    monkeypatch.setattr(settings, "GROUP_COMMIT", True)
+    try:
+        headers, project_id = setup_project_and_auth(client)
+        other_headers = get_auth_headers(client, "otheruser")
+        assert client.get(f"/projects/{project_id}", headers=other_headers).status_code == 403
+
+        updated = client.put(f"/projects/{project_id}", json={"title": "Renamed"}, headers=headers)
+        assert updated.status_code == 200 and updated.json()["title"] == "Renamed"
+        # The cached grant is dropped once the shared transaction commits
+        added = client.patch(f"/projects/{project_id}/contributors", json={"add": [2]}, headers=headers).json()
+        assert added == {"added": [2], "removed": []}
+        assert client.get(f"/projects/{project_id}", headers=other_headers).json()["title"] == "Renamed"
+
+        # A task deleted after the access check is a 404 raised inside the unit
+        with TestingSessionLocal() as db, pytest.raises(HTTPException) as missing:
+            run_write(db, lambda session: get_task_or_404(session, 12345))
+        assert missing.value.status_code == 404
+    finally:
+        shutdown_writers()
+
+def test_writer_failures_reach_callers(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'failing.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+
+    def fail_commit(conn):
+        raise RuntimeError("disk I/O error")
+
+    # A failed shared commit fails every unit of the batch, and the writer carries on
+    writer = GroupCommitWriter(engine, window_ms=0)
+    event.listen(engine, "commit", fail_commit)
+    with pytest.raises(RuntimeError, match="disk I/O error"):
+        writer.submit(lambda session: session.execute(insert(User), [{"username": "alice", "email": "alice@example.com", "hashed_password": "x"}]))
+    event.remove(engine, "commit", fail_commit)
+    writer.submit(lambda session: session.execute(insert(User), [{"username": "bobby", "email": "bobby@example.com", "hashed_password": "x"}]))
+    assert writer.alive
+    writer.close()
+
+    # If the writer thread itself dies, waiting and later callers get the error instead of hanging
+    def broken_batch(self, connection, batch):
+        raise RuntimeError("writer crashed")
+
+    monkeypatch.setattr(GroupCommitWriter, "_commit_batch", broken_batch)
+    writer = GroupCommitWriter(engine, window_ms=0)
+    with pytest.raises(RuntimeError, match="writer crashed"):
+        writer.submit(lambda session: None)
+    assert not writer.alive
+    with pytest.raises(RuntimeError, match="has stopped"):
+        writer.submit(lambda session: None)
+    writer.close()
+    engine.dispose()
@@ -0,0 +1,104 @@
+import re
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, inspect, text
+from app.db.database import Base
+from app.db.migrations import MIGRATIONS, run_migrations
+from tests.conftest import engine
+
+def test_migrations_upgrade_legacy_database_in_place(tmp_path):
+    legacy_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=legacy_engine)
+    with legacy_engine.begin() as connection:
+        # Simulate a database created before the managed indexes existed
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if len(index.columns) > 1:
+                    connection.exec_driver_sql(f"DROP INDEX {index.name}")
+        connection.exec_driver_sql(
+            "INSERT INTO users (username, email, hashed_password, is_active) VALUES ('legacy', 'legacy@example.com', 'x', 1)"
+        )
+
+    applied = run_migrations(legacy_engine)
+    assert [m.version for m in applied] == sorted(m.version for m in MIGRATIONS)
+    assert run_migrations(legacy_engine) == []
+
+    inspector = inspect(legacy_engine)
+    index_names = {index["name"] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+    assert {"ix_tasks_project_id_status_created_at", "ix_comments_task_id_created_at",
+            "ix_project_contributors_user_id_project_id"} <= index_names
+    with legacy_engine.connect() as connection:
+        assert connection.execute(text("SELECT username FROM users")).scalar() == "legacy"
+    legacy_engine.dispose()
+
+def test_migrations_backfill_project_access(tmp_path):
+    legacy_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=legacy_engine)
+    with legacy_engine.begin() as connection:
+        for user_id in (1, 2):
+            connection.exec_driver_sql(
+                f"INSERT INTO users (id, username, email, hashed_password, is_active) "
+                f"VALUES ({user_id}, 'user{user_id}', 'user{user_id}@example.com', 'x', 1)"
+            )
+        connection.exec_driver_sql(
+            "INSERT INTO projects (id, title, owner_id, created_at) VALUES (1, 'Legacy', 1, '2024-01-01 00:00:00')"
+        )
+        connection.exec_driver_sql("INSERT INTO project_contributors (project_id, user_id) VALUES (1, 2)")
+        connection.exec_driver_sql("INSERT INTO project_contributors (project_id, user_id) VALUES (1, 2)")
+
+    run_migrations(legacy_engine)
+    with legacy_engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT user_id, project_id, role FROM project_access ORDER BY user_id"
+        )).all()
+    assert [tuple(row) for row in rows] == [(1, 1, "OWNER"), (2, 1, "CONTRIBUTOR")]
+    legacy_engine.dispose()
+
+def login(client: TestClient, username: str):
+    client.post("/auth/signup", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "testpass123"
+    })
+    response = client.post("/auth/login", json={
+        "email": f"{username}@example.com",
+        "password": "testpass123"
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def test_crud_queries_use_indexes(client: TestClient):
+    owner = login(client, "owneruser")
+    member = login(client, "memberuser")
+    project_id = client.post("/projects/", json={"title": "Project"}, headers=owner).json()["id"]
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.split()[0] in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        client.post(f"/projects/{project_id}/contributors/2", headers=owner)
+        task_id = client.post(f"/projects/{project_id}/tasks", json={
+            "title": "Task", "project_id": project_id, "assigned_user_id": 2
+        }, headers=owner).json()["id"]
+        client.post(f"/tasks/{task_id}/comments", json={"text": "Comment"}, headers=member)
+        for url in ["/projects/", f"/projects/{project_id}", f"/projects/{project_id}/tasks",
+                    f"/projects/{project_id}/contributors",
+                    f"/tasks/{task_id}", f"/tasks/{task_id}/comments", "/tasks/status/todo",
+                    "/users/2/tasks", "/projects/users/1/projects"]:
+            response = client.get(url, params={"limit": 1}, headers=member)
+            assert response.status_code == 200
+            if "X-Next-Cursor" in response.headers:
+                client.get(url, params={"limit": 1, "after": response.headers["X-Next-Cursor"]}, headers=member)
+        client.put(f"/tasks/{task_id}", json={"status": "done"}, headers=member)
+        client.put(f"/projects/{project_id}", json={"title": "Renamed"}, headers=owner)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    full_scans = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = [row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+            if any(re.fullmatch(r"SCAN \w+", step) or "AUTOMATIC" in step for step in plan):
+                full_scans.append((statement, plan))
+    assert full_scans == []
@@ -46,4 +46,317 @@ def test_get_user_projects(client: TestClient):
 
 def test_unauthorized_access(client: TestClient):
     response = client.get("/projects/")
-    assert response.status_code == 403
\ No newline at end of file
+    assert response.status_code == 403
+
+def test_contributor_access_granted_after_add(client: TestClient):
+    owner_headers = get_auth_headers(client, "owneruser")
+    other_headers = get_auth_headers(client, "otheruser")
+    project_id = client.post("/projects/", json={"title": "Shared Project"}, headers=owner_headers).json()["id"]
+
+    response = client.get(f"/projects/{project_id}", headers=other_headers)
+    assert response.status_code == 403
+    assert "owneruser" in response.json()["detail"]
+
+    response = client.post(f"/projects/{project_id}/contributors/2", headers=owner_headers)
+    assert response.status_code == 200
+
+    # The cached denial must not survive the membership change
+    response = client.get(f"/projects/{project_id}", headers=other_headers)
+    assert response.status_code == 200
+    assert response.json()["contributor_count"] == 1
+
+    response = client.put(f"/projects/{project_id}", json={"title": "Renamed"}, headers=other_headers)
+    assert response.status_code == 403
+
+
+def test_bulk_update_contributors(client: TestClient):
+    owner_headers = get_auth_headers(client, "owneruser")
+    for name in ["alice", "bobby", "carol"]:
+        get_auth_headers(client, name)
+    project_id = client.post("/projects/", json={"title": "Team Project"}, headers=owner_headers).json()["id"]
+    client.post(f"/projects/{project_id}/contributors/2", headers=owner_headers)
+
+    response = client.patch(f"/projects/{project_id}/contributors", json={"add": [2, 3, 4]}, headers=owner_headers)
+    assert response.status_code == 200
+    assert response.json() == {"added": [3, 4], "removed": []}
+
+    response = client.patch(f"/projects/{project_id}/contributors", json={"remove": [1, 3]}, headers=owner_headers)
+    assert response.json() == {"added": [], "removed": [3]}
+
+    contributors = client.get(f"/projects/{project_id}/contributors", headers=owner_headers).json()
+    assert [user["id"] for user in contributors] == [2, 4]
+
+    response = client.patch(f"/projects/{project_id}/contributors", json={"add": [99]}, headers=owner_headers)
+    assert response.status_code == 404
+
+
+def test_project_contributors_paginated(client: TestClient):
+    owner_headers = get_auth_headers(client, "owneruser")
+    for name in ["alice", "bobby", "carol"]:
+        get_auth_headers(client, name)
+    project_id = client.post("/projects/", json={"title": "Team Project"}, headers=owner_headers).json()["id"]
+    client.patch(f"/projects/{project_id}/contributors", json={"add": [2, 3, 4]}, headers=owner_headers)
+
+    projects = client.get("/projects/", headers=owner_headers).json()
+    assert projects[0]["contributor_count"] == 3
+    assert "contributors" not in projects[0]
+
+    response = client.get(f"/projects/{project_id}/contributors", params={"limit": 2}, headers=owner_headers)
+    assert [user["username"] for user in response.json()] == ["alice", "bobby"]
+    response = client.get(f"/projects/{project_id}/contributors", headers=owner_headers,
+                          params={"limit": 2, "after": response.headers["X-Next-Cursor"]})
+    assert [user["username"] for user in response.json()] == ["carol"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_export_project_ndjson(client: TestClient):
+    import json
+    owner_headers = get_auth_headers(client, "owneruser")
+    other_headers = get_auth_headers(client, "otheruser")
+    project_id = client.post("/projects/", json={"title": "Exported"}, headers=owner_headers).json()["id"]
+    client.post(f"/projects/{project_id}/contributors/2", headers=owner_headers)
+    tasks = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": "First", "project_id": project_id},
+        {"title": "Second", "project_id": project_id, "assigned_user_id": 2},
+    ]}, headers=owner_headers).json()
+    client.post(f"/tasks/{tasks[1]['id']}/comments", json={"text": "Looks good"}, headers=other_headers)
+
+    response = client.get(f"/projects/{project_id}/export", headers=other_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["type"] for record in records] == ["project", "contributor", "task", "task", "comment"]
+    assert records[0]["title"] == "Exported"
+    assert records[1]["username"] == "otheruser"
+    assert records[3]["status"] == "todo" and records[3]["assigned_user_id"] == 2
+    assert records[4] == {**records[4], "task_id": tasks[1]["id"], "author_id": 2, "text": "Looks good"}
+
+    third_headers = get_auth_headers(client, "thirduser")
+    assert client.get(f"/projects/{project_id}/export", headers=third_headers).status_code == 403
+
+def test_import_round_trips_export(client: TestClient):
+    owner_headers = get_auth_headers(client, "owneruser")
+    other_headers = get_auth_headers(client, "otheruser")
+    project_id = client.post("/projects/", json={"title": "Legacy"}, headers=owner_headers).json()["id"]
+    tasks = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": "First", "project_id": project_id},
+        {"title": "Second", "project_id": project_id, "assigned_user_id": 1},
+    ]}, headers=owner_headers).json()
+    client.post(f"/tasks/{tasks[1]['id']}/comments", json={"text": "Imported comment"}, headers=owner_headers)
+    export = client.get(f"/projects/{project_id}/export", headers=owner_headers).content
+    export += b'{"type": "task", "id": 99, "project_id": 12345, "title": "Orphan"}\n{"type": "task", "project_id": 1, "title": ""}\n'
+
+    response = client.post("/projects/import", files={"file": ("legacy.ndjson", export)}, headers=other_headers)
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["projects"], summary["tasks"], summary["comments"]) == (1, 2, 1)
+    assert summary["error_count"] == 2
+    assert [error["line"] for error in summary["errors"]] == [6, 5]
+
+    imported = client.get("/projects/", headers=other_headers).json()
+    assert [project["title"] for project in imported] == ["Legacy"]
+    imported_tasks = client.get(f"/projects/{imported[0]['id']}/tasks", headers=other_headers).json()
+    assert [(task["title"], task["assigned_user_id"]) for task in imported_tasks] == [("First", None), ("Second", 1)]
+    comments = client.get(f"/tasks/{imported_tasks[1]['id']}/comments", headers=other_headers).json()
+    assert [(comment["text"], comment["author_id"]) for comment in comments] == [("Imported comment", 1)]
+
+def test_import_csv(client: TestClient):
+    headers = get_auth_headers(client)
+    rows = (
+        "type,id,title,description,project_id,task_id,status,text\n"
+        "project,501,Board,,,,,\n"
+        "task,601,Write docs,,501,,done,\n"
+        "task,602,Bad status,,501,,finished,\n"
+        "comment,,,,,601,,Done already\n"
+    )
+    response = client.post("/projects/import", files={"file": ("tracker.csv", rows)}, headers=headers)
+    summary = response.json()
+    assert (summary["projects"], summary["tasks"], summary["comments"], summary["error_count"]) == (1, 1, 1, 1)
+    assert summary["errors"][0]["line"] == 4
+
+    # Imported rows are in the change log like any other insert
+    from app.models.change import ProjectChange
+    from tests.conftest import TestingSessionLocal
+    project_id = client.get("/projects/", headers=headers).json()[0]["id"]
+    with TestingSessionLocal() as db:
+        changes = db.query(ProjectChange).filter(ProjectChange.project_id == project_id).order_by(ProjectChange.id).all()
+    assert [(change.entity.value, change.op.value) for change in changes] == [
+        ("project", "insert"), ("task", "insert"), ("comment", "insert")
+    ]
+
+    assert client.post("/projects/import", files={"file": ("tracker.xml", rows)}, headers=headers).status_code == 400
+
+def test_conditional_get_with_project_version(client: TestClient):
+    headers = get_auth_headers(client)
+    project_id = client.post("/projects/", json={"title": "Polled"}, headers=headers).json()["id"]
+    task_id = client.post(f"/projects/{project_id}/tasks", json={"title": "Task", "project_id": project_id}, headers=headers).json()["id"]
+
+    first = client.get(f"/projects/{project_id}", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.json()["version"] == 2
+    not_modified = client.get(f"/projects/{project_id}", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    tasks_etag = client.get(f"/projects/{project_id}/tasks", headers=headers).headers["ETag"]
+    assert tasks_etag != etag
+    assert client.get(f"/projects/{project_id}/tasks?limit=1", headers={**headers, "If-None-Match": tasks_etag}).status_code == 200
+    assert client.get(f"/projects/{project_id}/tasks", headers={**headers, "If-None-Match": tasks_etag}).status_code == 304
+
+    updated = client.put(f"/tasks/{task_id}", json={"status": "done"}, headers=headers).json()
+    assert updated["version"] == 2
+    changed = client.get(f"/projects/{project_id}/tasks", headers={**headers, "If-None-Match": tasks_etag})
+    assert changed.status_code == 200 and changed.json()[0]["status"] == "done"
+
+    client.post(f"/tasks/{task_id}/comments", json={"text": "Noted"}, headers=headers)
+    assert client.get(f"/projects/{project_id}", headers={**headers, "If-None-Match": etag}).json()["version"] == 4
+
+def test_response_cache_serves_repeat_reads_and_drops_them_on_write(client: TestClient):
+    owner_headers = get_auth_headers(client, "owneruser")
+    outsider_headers = get_auth_headers(client, "otheruser")
+    project_id = client.post("/projects/", json={"title": "Hot"}, headers=owner_headers).json()["id"]
+    task_id = client.post(f"/projects/{project_id}/tasks", json={"title": "Task", "project_id": project_id}, headers=owner_headers).json()["id"]
+
+    def responses():
+        return client.get("/cache/stats", headers=owner_headers).json()["responses"]
+
+    first = client.get(f"/projects/{project_id}/tasks", headers=owner_headers)
+    second = client.get(f"/projects/{project_id}/tasks", headers=owner_headers)
+    assert first.json() == second.json() and first.headers["ETag"] == second.headers["ETag"]
+    assert (responses()["hits"], responses()["misses"]) == (1, 1)
+
+    assert client.get(f"/projects/{project_id}/tasks", headers=outsider_headers).status_code == 403
+    assert client.get(f"/tasks/{task_id}/comments", headers=outsider_headers).status_code == 403
+
+    client.get(f"/tasks/{task_id}/comments", headers=owner_headers)
+    client.post(f"/tasks/{task_id}/comments", json={"text": "Fresh"}, headers=owner_headers)
+    assert responses()["size"] == 0
+    assert [c["text"] for c in client.get(f"/tasks/{task_id}/comments", headers=owner_headers).json()] == ["Fresh"]
+    client.put(f"/projects/{project_id}", json={"title": "Renamed"}, headers=owner_headers)
+    assert client.get(f"/projects/{project_id}", headers=owner_headers).json()["title"] == "Renamed"
+
+def test_get_project_with_included_tasks_and_recent_comments(client: TestClient):
+    headers = get_auth_headers(client)
+    project_id = client.post("/projects/", json={"title": "Dashboard"}, headers=headers).json()["id"]
+    tasks = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": f"Task {i}", "project_id": project_id, "assigned_user_id": 1} for i in range(3)
+    ]}, headers=headers).json()
+    for text in ["one", "two", "three"]:
+        client.post(f"/tasks/{tasks[0]['id']}/comments", json={"text": text}, headers=headers)
+
+    plain = client.get(f"/projects/{project_id}", headers=headers).json()
+    assert "tasks" not in plain
+
+    response = client.get(f"/projects/{project_id}?include=tasks.comments&tasks_limit=2&comments_limit=2", headers=headers)
+    assert response.status_code == 200
+    document = response.json()
+    assert document["title"] == "Dashboard"
+    assert [task["title"] for task in document["tasks"]] == ["Task 0", "Task 1"]
+    assert document["tasks"][0]["assigned_user"]["username"] == "testuser"
+    assert [comment["text"] for comment in document["tasks"][0]["comments"]] == ["two", "three"]
+    assert document["tasks"][1]["comments"] == []
+    rest = client.get(f"/projects/{project_id}/tasks?after={document['tasks_next_cursor']}", headers=headers).json()
+    assert [task["title"] for task in rest] == ["Task 2"]
+
+    only_tasks = client.get(f"/projects/{project_id}?include=tasks&fields=id", headers=headers).json()
+    assert set(only_tasks) == {"id", "tasks", "tasks_next_cursor"} and "comments" not in only_tasks["tasks"][0]
+    assert client.get(f"/projects/{project_id}?include=owner", headers=headers).status_code == 400
+
+def test_project_stats_follow_writes_and_match_rebuild(client: TestClient):
+    from app.crud.stats import stats_crud
+    from tests.conftest import TestingSessionLocal
+    headers = get_auth_headers(client)
+    project_id = client.post("/projects/", json={"title": "Tracked"}, headers=headers).json()["id"]
+    assert client.get(f"/projects/{project_id}/stats", headers=headers).json()["task_count"] == 0
+
+    tasks = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": f"Task {i}", "project_id": project_id, "assigned_user_id": 1 if i < 3 else None} for i in range(4)
+    ]}, headers=headers).json()
+    client.post(f"/projects/{project_id}/tasks", json={"title": "Single", "project_id": project_id}, headers=headers)
+    client.put(f"/tasks/{tasks[0]['id']}", json={"status": "in_progress"}, headers=headers)
+    client.post(f"/projects/{project_id}/tasks/bulk-update", json={
+        "task_ids": [tasks[1]["id"], tasks[2]["id"]], "changes": {"status": "done"}
+    }, headers=headers)
+    client.post(f"/tasks/{tasks[2]['id']}/comments", json={"text": "First"}, headers=headers)
+    client.post(f"/tasks/{tasks[3]['id']}/comments", json={"text": "Second"}, headers=headers)
+    assert client.delete(f"/tasks/{tasks[3]['id']}", headers=headers).status_code == 200
+
+    stats = client.get(f"/projects/{project_id}/stats", headers=headers).json()
+    assert stats["task_count"] == 4
+    assert stats["tasks_by_status"] == {"todo": 1, "in_progress": 1, "done": 2}
+    assert stats["assignees"] == [{"user_id": 1, "task_count": 3, "done_count": 2}]
+    assert stats["comment_count"] == 1
+    assert stats["last_activity_at"] is not None
+
+    db = TestingSessionLocal()
+    try:
+        stats_crud.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    assert client.get(f"/projects/{project_id}/stats", headers=headers).json() == stats
+
+def test_null_status_update_rejected(client: TestClient):
+    from app.crud.stats import stats_crud
+    from tests.conftest import TestingSessionLocal
+    headers = get_auth_headers(client)
+    project_id = client.post("/projects/", json={"title": "Tracked"}, headers=headers).json()["id"]
+    task_id = client.post(f"/projects/{project_id}/tasks", json={"title": "Task", "project_id": project_id}, headers=headers).json()["id"]
+
+    assert client.put(f"/tasks/{task_id}", json={"status": None}, headers=headers).status_code == 422
+    tasks = client.get(f"/projects/{project_id}/tasks", headers=headers)
+    assert tasks.status_code == 200 and tasks.json()[0]["status"] == "todo"
+
+    stats = client.get(f"/projects/{project_id}/stats", headers=headers).json()
+    with TestingSessionLocal() as db:
+        stats_crud.rebuild(db)
+        db.commit()
+    assert client.get(f"/projects/{project_id}/stats", headers=headers).json() == stats
+
+def test_project_changes_delta_sync_and_compaction(client: TestClient):
+    from datetime import datetime, timedelta
+    from app.crud.changes import change_crud
+    from tests.conftest import TestingSessionLocal
+    headers = get_auth_headers(client)
+    project_id = client.post("/projects/", json={"title": "Synced"}, headers=headers).json()["id"]
+    kept = client.post(f"/projects/{project_id}/tasks", json={"title": "Kept", "project_id": project_id}, headers=headers).json()
+    gone = client.post(f"/projects/{project_id}/tasks", json={"title": "Gone", "project_id": project_id}, headers=headers).json()
+
+    # A client without a cursor reloads the project, then syncs from the cursor it was given
+    initial = client.get(f"/projects/{project_id}/changes", headers=headers).json()
+    assert initial["resync_required"] and initial["changes"] == []
+    cursor = initial["cursor"]
+    assert client.get(f"/projects/{project_id}/changes", params={"since": cursor}, headers=headers).json()["changes"] == []
+
+    client.put(f"/tasks/{kept['id']}", json={"title": "Renamed"}, headers=headers)
+    client.put(f"/tasks/{kept['id']}", json={"status": "done"}, headers=headers)
+    comment = client.post(f"/tasks/{gone['id']}/comments", json={"text": "Soon deleted"}, headers=headers).json()
+    client.delete(f"/tasks/{gone['id']}", headers=headers)
+    client.put(f"/projects/{project_id}", json={"title": "Synced again"}, headers=headers)
+
+    delta = client.get(f"/projects/{project_id}/changes", params={"since": cursor}, headers=headers).json()
+    assert [(change["entity"], change["entity_id"], change["op"]) for change in delta["changes"]] == [
+        ("task", kept["id"], "update"), ("comment", comment["id"], "delete"),
+        ("task", gone["id"], "delete"), ("project", project_id, "update")
+    ]
+    assert [(task["id"], task["title"], task["status"]) for task in delta["tasks"]] == [(kept["id"], "Renamed", "done")]
+    assert delta["comments"] == [] and delta["project"]["title"] == "Synced again"
+    assert not delta["has_more"] and not delta["resync_required"]
+
+    page = client.get(f"/projects/{project_id}/changes", params={"since": cursor, "limit": 2}, headers=headers).json()
+    assert page["has_more"] and [change["entity_id"] for change in page["changes"]] == [kept["id"]]
+
+    # Superseded entries are compacted without bothering clients; expired ones force a resync
+    db = TestingSessionLocal()
+    try:
+        assert change_crud.compact(db, older_than=datetime.utcnow() - timedelta(days=1)) == (5, 0)
+        db.commit()
+        latest = client.get(f"/projects/{project_id}/changes", params={"since": cursor}, headers=headers).json()
+        assert latest["changes"] == delta["changes"]
+        change_crud.compact(db, older_than=datetime.utcnow() + timedelta(seconds=1))
+        db.commit()
+    finally:
+        db.close()
+    stale = client.get(f"/projects/{project_id}/changes", params={"since": cursor}, headers=headers).json()
+    assert stale["resync_required"] and stale["cursor"] == delta["cursor"]
+    assert client.get(f"/projects/{project_id}/changes", params={"since": stale["cursor"]}, headers=headers).json()["changes"] == []
+    assert client.get(f"/projects/{project_id}/changes", params={"since": "bogus"}, headers=headers).status_code == 400
@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.response_cache import response_cache
+
+def signup_and_login(client: TestClient, username: str):
+    user = client.post("/auth/signup", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "testpass123"
+    }).json()
+    response = client.post("/auth/login", json={
+        "email": f"{username}@example.com",
+        "password": "testpass123"
+    })
+    return user["id"], {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def count_queries(client: TestClient, query_counter, url: str, headers: dict) -> int:
+    # Warm the principal and access caches so only the listing itself is counted,
+    # but not the response cache, which would hide the listing entirely
+    assert client.get(url, headers=headers).status_code == 200
+    response_cache.clear()
+    query_counter.count = 0
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return query_counter.count
+
+def add_rows(client: TestClient, headers: dict, project_id: int, members: list, task_id: int = None):
+    for user_id, member_headers in members:
+        client.post(f"/projects/{project_id}/contributors/{user_id}", headers=headers)
+        task = client.post(f"/projects/{project_id}/tasks", json={
+            "title": f"Task for {user_id}",
+            "project_id": project_id,
+            "assigned_user_id": user_id
+        }, headers=headers).json()
+        client.post(f"/tasks/{task_id or task['id']}/comments", json={"text": f"Comment {user_id}"}, headers=member_headers)
+    return task["id"]
+
+def test_list_endpoints_query_count_independent_of_size(client: TestClient, query_counter):
+    owner_id, headers = signup_and_login(client, "owneruser")
+    members = [signup_and_login(client, f"member{i}") for i in range(4)]
+    project_id = client.post("/projects/", json={"title": "Project"}, headers=headers).json()["id"]
+    task_id = add_rows(client, headers, project_id, members[:1])
+
+    urls = [
+        "/projects/",
+        f"/projects/{project_id}/tasks",
+        f"/tasks/{task_id}/comments",
+        "/tasks/status/todo",
+        f"/users/{members[0][0]}/tasks",
+        f"/projects/users/{owner_id}/projects",
+        f"/projects/{project_id}?include=tasks.comments",
+    ]
+    small = {url: count_queries(client, query_counter, url, headers) for url in urls}
+
+    # More projects, contributors, assignees, and comments by different authors
+    for title in ["Second", "Third"]:
+        other_id = client.post("/projects/", json={"title": title}, headers=headers).json()["id"]
+        add_rows(client, headers, other_id, members)
+    add_rows(client, headers, project_id, members[1:], task_id=task_id)
+
+    large = {url: count_queries(client, query_counter, url, headers) for url in urls}
+    assert large == small
@@ -0,0 +1,18 @@
+import asyncio
+from app.core.security import get_password_hash_async, verify_password_async, shutdown_password_hashing
+
+def test_async_password_hashing_round_trip():
+    async def round_trip():
+        hashed = await get_password_hash_async("testpass123")
+        results = await asyncio.gather(
+            verify_password_async("testpass123", hashed),
+            verify_password_async("wrongpass123", hashed),
+        )
+        return hashed, results
+
+    try:
+        hashed, results = asyncio.run(round_trip())
+    finally:
+        shutdown_password_hashing()
+    assert hashed.startswith("$pbkdf2-sha256$")
+    assert results == [True, False]
@@ -55,4 +55,256 @@ def test_get_project_tasks(client: TestClient):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
-    assert data[0]["title"] == "Test Task"
\ No newline at end of file
+    assert data[0]["title"] == "Test Task"
+
+def test_get_tasks_by_status_only_accessible_projects(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+    client.post(f"/projects/{project_id}/tasks", json={
+        "title": "Visible Task",
+        "project_id": project_id
+    }, headers=headers)
+
+    # A second user with their own project and task
+    client.post("/auth/signup", json={
+        "username": "otheruser",
+        "email": "other@example.com",
+        "password": "testpass123"
+    })
+    response = client.post("/auth/login", json={
+        "email": "other@example.com",
+        "password": "testpass123"
+    })
+    other_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    other_project = client.post("/projects/", json={"title": "Other Project"}, headers=other_headers).json()
+    client.post(f"/projects/{other_project['id']}/tasks", json={
+        "title": "Hidden Task",
+        "project_id": other_project["id"]
+    }, headers=other_headers)
+
+    response = client.get("/tasks/status/todo", headers=headers)
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Visible Task"]
+
+    # Contributors see the tasks of projects they were added to
+    client.post(f"/projects/{project_id}/contributors/2", headers=headers)
+    response = client.get("/tasks/status/todo", headers=other_headers)
+    assert sorted(task["title"] for task in response.json()) == ["Hidden Task", "Visible Task"]
+
+
+def test_get_project_tasks_keyset_pagination(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+    for i in range(5):
+        client.post(f"/projects/{project_id}/tasks", json={
+            "title": f"Task {i}",
+            "project_id": project_id
+        }, headers=headers)
+
+    titles = []
+    params = {"limit": 2}
+    while True:
+        response = client.get(f"/projects/{project_id}/tasks", params=params, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        titles += [task["title"] for task in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["after"] = response.headers["X-Next-Cursor"]
+    assert titles == [f"Task {i}" for i in range(5)]
+
+    response = client.get(f"/projects/{project_id}/tasks", params={"after": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+    # Well-formed cursors with values of the wrong type are rejected too
+    from app.crud.pagination import encode_cursor
+    for values in (["2020-01-01T00:00:00", {"a": 1}], ["2020-01-01T00:00:00", "1"], ["2020-01-01T00:00:00", True], [1, 1]):
+        response = client.get(f"/projects/{project_id}/tasks", params={"after": encode_cursor(values)}, headers=headers)
+        assert response.status_code == 400
+
+
+def test_create_tasks_batch(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+
+    response = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": f"Task {i}", "project_id": project_id, "assigned_user_id": 1} for i in range(3)
+    ]}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data] == ["Task 0", "Task 1", "Task 2"]
+    assert all(task["status"] == "todo" and task["assigned_user"]["username"] == "testuser" for task in data)
+
+    response = client.get(f"/projects/{project_id}/tasks", headers=headers)
+    assert len(response.json()) == 3
+
+def test_create_tasks_batch_is_all_or_nothing(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+
+    response = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": "Valid", "project_id": project_id},
+        {"title": "   ", "project_id": project_id},
+        {"title": "Unknown assignee", "project_id": project_id, "assigned_user_id": 99},
+    ]}, headers=headers)
+    assert response.status_code == 422
+    assert [error["index"] for error in response.json()["detail"]] == [1, 2]
+
+    response = client.get(f"/projects/{project_id}/tasks", headers=headers)
+    assert response.json() == []
+
+
+def test_bulk_update_tasks(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+    tasks = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": f"Task {i}", "project_id": project_id, "assigned_user_id": 1 if i < 2 else None} for i in range(4)
+    ]}, headers=headers).json()
+
+    response = client.post(f"/projects/{project_id}/tasks/bulk-update", json={
+        "task_ids": [tasks[0]["id"], tasks[2]["id"]],
+        "changes": {"status": "done"}
+    }, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2, "task_ids": [tasks[0]["id"], tasks[2]["id"]]}
+
+    response = client.post(f"/projects/{project_id}/tasks/bulk-update", json={
+        "filter": {"assigned_user_id": 1},
+        "changes": {"assigned_user_id": None, "status": "in_progress"}
+    }, headers=headers)
+    assert response.json()["task_ids"] == [tasks[0]["id"], tasks[1]["id"]]
+
+    data = {task["id"]: task for task in client.get(f"/projects/{project_id}/tasks", headers=headers).json()}
+    assert [data[task["id"]]["status"] for task in tasks] == ["in_progress", "in_progress", "done", "todo"]
+    assert all(task["assigned_user_id"] is None for task in data.values())
+
+    response = client.post(f"/projects/{project_id}/tasks/bulk-update", json={
+        "filter": {}, "changes": {"title": "  "}
+    }, headers=headers)
+    assert response.status_code == 422
+
+def test_bulk_update_null_filter_and_changes(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+    tasks = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": f"Task {i}", "project_id": project_id, "assigned_user_id": 1 if i == 0 else None} for i in range(3)
+    ]}, headers=headers).json()
+
+    # A null filter value selects unassigned tasks only
+    response = client.post(f"/projects/{project_id}/tasks/bulk-update", json={
+        "filter": {"assigned_user_id": None}, "changes": {"status": "done"}
+    }, headers=headers)
+    assert response.json()["task_ids"] == [tasks[1]["id"], tasks[2]["id"]]
+
+    # An empty filter would select every task, and status cannot be cleared
+    for payload in ({"filter": {}, "changes": {"status": "done"}},
+                    {"task_ids": [tasks[0]["id"]], "changes": {"status": None}}):
+        response = client.post(f"/projects/{project_id}/tasks/bulk-update", json=payload, headers=headers)
+        assert response.status_code == 422
+
+    data = {task["id"]: task["status"] for task in client.get(f"/projects/{project_id}/tasks", headers=headers).json()}
+    assert [data[task["id"]] for task in tasks] == ["todo", "done", "done"]
+    assert client.get(f"/projects/{project_id}/stats", headers=headers).json()["tasks_by_status"] == {"todo": 1, "in_progress": 0, "done": 2}
+
+def test_fast_serialization_matches_default_path(client: TestClient, monkeypatch):
+    from app.core.config import settings
+    from app.core.response_cache import response_cache
+    headers, project_id = setup_project_and_auth(client)
+    tasks = client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": "Unassigned", "description": "Plain", "project_id": project_id},
+        {"title": "Assigned", "project_id": project_id, "assigned_user_id": 1},
+    ]}, headers=headers).json()
+    client.put(f"/tasks/{tasks[0]['id']}", json={"status": "in_progress"}, headers=headers)
+    client.post(f"/tasks/{tasks[1]['id']}/comments", json={"text": "Première remarque"}, headers=headers)
+
+    urls = [
+        f"/projects/{project_id}/tasks?limit=1",
+        f"/tasks/{tasks[1]['id']}/comments",
+        "/projects/",
+        "/tasks/status/todo",
+        "/users/1/tasks",
+        "/projects/users/1/projects",
+    ]
+    def fetch():
+        response_cache.clear()
+        return [client.get(url, headers=headers) for url in urls]
+
+    default = fetch()
+    monkeypatch.setattr(settings, "FAST_SERIALIZATION", True)
+    fast = fetch()
+    for url, expected, actual in zip(urls, default, fast):
+        assert actual.status_code == 200, url
+        assert actual.content == expected.content, url
+        assert actual.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor"), url
+
+def test_sparse_fieldsets_prune_columns_and_output(client: TestClient):
+    from sqlalchemy import event
+    from tests.conftest import engine
+    headers, project_id = setup_project_and_auth(client)
+    client.post(f"/projects/{project_id}/tasks/batch", json={"tasks": [
+        {"title": f"Task {i}", "description": "Long description", "project_id": project_id, "assigned_user_id": 1}
+        for i in range(3)
+    ]}, headers=headers)
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(f"/projects/{project_id}/tasks?fields=title,id,status&limit=2", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert response.status_code == 200
+    assert [set(task) for task in response.json()] == [{"id", "title", "status"}] * 2
+    listing = next(statement for statement in statements if "FROM tasks" in statement and "LIMIT" in statement)
+    assert "description" not in listing and "users" not in listing
+
+    next_page = client.get(f"/projects/{project_id}/tasks?fields=title&after={response.headers['X-Next-Cursor']}", headers=headers)
+    assert next_page.json() == [{"title": "Task 2"}]
+
+    task_id = response.json()[0]["id"]
+    assert client.get(f"/tasks/{task_id}?fields=status,assigned_user", headers=headers).json() == {
+        "status": "todo", "assigned_user": {"username": "testuser", "email": "test@example.com", "id": 1, "is_active": True}
+    }
+    assert [set(p) for p in client.get("/projects/?fields=id,owner", headers=headers).json()] == [{"id", "owner"}]
+    client.post(f"/tasks/{task_id}/comments", json={"text": "Short"}, headers=headers)
+    assert client.get(f"/tasks/{task_id}/comments?fields=text", headers=headers).json() == [{"text": "Short"}]
+
+    invalid = client.get(f"/projects/{project_id}/tasks?fields=title,secret", headers=headers)
+    assert invalid.status_code == 400 and "secret" in invalid.json()["detail"]
+
+def test_search_tasks_and_comments(client: TestClient):
+    headers, project_id = setup_project_and_auth(client)
+    first = client.post(f"/projects/{project_id}/tasks", json={
+        "title": "Fix login redirect", "description": "Users land on a blank page", "project_id": project_id
+    }, headers=headers).json()
+    second = client.post(f"/projects/{project_id}/tasks", json={
+        "title": "Write release notes", "description": "Mention the login fix", "project_id": project_id
+    }, headers=headers).json()
+    client.post(f"/tasks/{second['id']}/comments", json={"text": "Draft is in the shared drive"}, headers=headers)
+
+    # A title match outranks a description match; the last word matches as a prefix
+    response = client.get("/search", params={"q": "logi"}, headers=headers)
+    assert response.status_code == 200
+    assert [(hit["kind"], hit["id"]) for hit in response.json()] == [("task", first["id"]), ("task", second["id"])]
+    assert "[login]" in response.json()[0]["snippet"]
+
+    page = client.get("/search", params={"q": "login", "limit": 1}, headers=headers)
+    assert [hit["id"] for hit in page.json()] == [first["id"]]
+    next_page = client.get("/search", params={"q": "login", "limit": 1, "after": page.headers["X-Next-Cursor"]}, headers=headers)
+    assert [hit["id"] for hit in next_page.json()] == [second["id"]] and "X-Next-Cursor" not in next_page.headers
+
+    hits = client.get("/search", params={"q": "shared drive"}, headers=headers).json()
+    assert [(hit["kind"], hit["task_id"], hit["task_title"]) for hit in hits] == [("comment", second["id"], "Write release notes")]
+
+    # The index follows updates and deletes
+    client.put(f"/tasks/{first['id']}", json={"title": "Fix signup redirect"}, headers=headers)
+    client.delete(f"/tasks/{second['id']}", headers=headers)
+    assert [hit["id"] for hit in client.get("/search", params={"q": "signup"}, headers=headers).json()] == [first["id"]]
+    assert client.get("/search", params={"q": "login"}, headers=headers).json() == []
+    assert client.get("/search", params={"q": "drive"}, headers=headers).json() == []
+
+    # Operator characters are taken literally
+    assert client.get("/search", params={"q": 'redirect OR "*'}, headers=headers).json() == []
+    assert client.get("/search", params={"q": '"'}, headers=headers).status_code == 400
+
+    # Projects the user cannot access are never searched
+    client.post("/auth/signup", json={"username": "otheruser", "email": "other@example.com", "password": "testpass123"})
+    token = client.post("/auth/login", json={"email": "other@example.com", "password": "testpass123"}).json()["access_token"]
+    other_headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/search", params={"q": "redirect"}, headers=other_headers).json() == []
+    assert client.get("/search", params={"q": "redirect", "project_id": project_id}, headers=other_headers).status_code == 403